@@ -0,0 +1,78 @@
+import argparse
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pokedex_core import export_dexes
+from pokedex_core.store import TYPE_NAMES
+
+# Throughput of the batch exporter in dexes per second, in process and with
+# process pools of increasing size:
+#
+#   python benchmarks/bench_export.py --dexes 500 --formats json,txt,csv,md
+
+
+def make_definitions(count):
+    # Type / evolution / stat combinations, cycled until there are enough
+    variants = itertools.product(
+        TYPE_NAMES,
+        (False, True),
+        ("", "bst>=450", "spe>90"),
+        (None, "bst"),
+    )
+    definitions = []
+    for i, (type_name, final, stat_filter, sort_by) in enumerate(itertools.cycle(variants)):
+        if i == count:
+            break
+        definitions.append({
+            "name": f"dex-{i:05d}",
+            "search": f"type:{type_name}",
+            "final_evolutions_only": final,
+            "include_chains": not final,
+            "stat_filter": stat_filter,
+            "sort_by": sort_by,
+        })
+    return definitions
+
+
+def run(definitions, formats, data_dir, workers):
+    output_dir = tempfile.mkdtemp(prefix="bench-export-")
+    try:
+        start = time.perf_counter()
+        results = list(export_dexes(definitions, output_dir, formats, data_dir, workers))
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir)
+    errors = [result for result in results if result[3]]
+    if errors:
+        print(f"{len(errors)} dexes failed, first error: {errors[0][3]}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch dex exporter")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--dexes", type=int, default=500)
+    parser.add_argument("--formats", default="json,txt,csv,md")
+    parser.add_argument("--workers", default=None, help="comma separated pool sizes, 0 is in process")
+    args = parser.parse_args()
+
+    formats = args.formats.split(",")
+    cpus = os.cpu_count() or 1
+    pool_sizes = [int(w) for w in args.workers.split(",")] if args.workers else sorted({0, 1, 2, cpus})
+    definitions = make_definitions(args.dexes)
+
+    print(f"{len(definitions)} dexes, formats: {', '.join(formats)}")
+    print(f"{'workers':>8} {'seconds':>8} {'dexes/s':>8}")
+    for workers in pool_sizes:
+        elapsed = run(definitions, formats, args.data_dir, workers)
+        print(f"{workers:>8} {elapsed:>8.2f} {len(definitions) / elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
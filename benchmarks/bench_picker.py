@@ -0,0 +1,238 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Startup and interaction timings of the picker on synthetic datasets:
+#
+#   python benchmarks/bench_picker.py                      # 1k, 5k and 20k entries
+#   python benchmarks/bench_picker.py --sizes 5000 --tk stub --output run.json
+#
+# Every size runs in a fresh interpreter, so cold start includes importing
+# the GUI and peak RSS belongs to that size alone. With --tk auto a real Tk
+# root is used when a display is available (e.g. under xvfb-run), otherwise
+# the headless stub from tk_stub.py. Results are printed as a table and,
+# with --output, written as JSON for comparing runs.
+
+SIZES = (1000, 5000, 20000)
+SYLLABLES = (
+    "pi", "ka", "chu", "bul", "ba", "saur", "char", "man", "der", "squir", "tle",
+    "wart", "or", "ton", "ee", "vee", "gar", "dos", "mew", "drag", "o", "nite",
+    "lu", "gi", "ra", "zor", "fla", "re", "on", "sno", "lax", "gen", "gar", "tyr",
+)
+TYPE_NAMES = (
+    "normal", "fire", "water", "electric", "grass", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy",
+)
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+QUERIES = ("pikachu", "dragonite", "type:fire", "ability:ab", "zor")
+
+
+def make_dataset(data_dir, size, seed=0):
+    # pokemon_data_sorted.json, evolution_chains.json and
+    # abilities_flavor_text.json shaped like the fetched files
+    rng = random.Random(seed)
+    abilities = [f"ability-{i}" for i in range(max(50, size // 4))]
+
+    names, pokemon = set(), []
+    while len(pokemon) < size:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if name in names:
+            continue
+        names.add(name)
+        pokemon.append({
+            "id": len(pokemon) + 1,
+            "name": name,
+            "types": rng.sample(TYPE_NAMES, rng.randint(1, 2)),
+            "normal_abilities": rng.sample(abilities, rng.randint(1, 2)),
+            "hidden_abilities": rng.sample(abilities, rng.randint(0, 1)),
+            "stats": {stat: rng.randint(20, 160) for stat in STAT_NAMES},
+        })
+
+    chains, position = {}, 0
+    while position < size:
+        length = min(rng.choice((1, 2, 3, 3)), size - position)
+        members = [entry["name"] for entry in pokemon[position:position + length]]
+        chains[str(len(chains) + 1)] = {members[0]: {
+            "final_forms": members[-1:],
+            "full_chain": members,
+            "edges": [list(edge) for edge in zip(members, members[1:])],
+        }}
+        position += length
+
+    flavor_texts = {
+        ability: {"en": f"The {ability} ability.", "fr": f"Le talent {ability}."}
+        for ability in abilities
+    }
+
+    os.makedirs(os.path.join(data_dir, "images", "pokemons"), exist_ok=True)
+    os.makedirs(os.path.join(data_dir, "images", "types"), exist_ok=True)
+    for filename, data in (
+        ("pokemon_data_sorted.json", pokemon),
+        ("evolution_chains.json", chains),
+        ("abilities_flavor_text.json", flavor_texts),
+    ):
+        with open(os.path.join(data_dir, filename), "w") as file:
+            json.dump(data, file)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_size(data_dir, tk_mode, rounds):
+    # Runs inside the per-size interpreter
+    start = time.perf_counter()
+    if tk_mode == "stub":
+        import tk_stub
+        tk_stub.install()
+    import tkinter as tk
+    import pokedex3
+    root = tk.Tk()
+    if tk_mode != "stub":
+        root.withdraw()
+    pump = root.run_pending if tk_mode == "stub" else root.update
+
+    # The picker prints debug output on clicks; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        project_path = os.path.join(os.path.dirname(data_dir), "bench.pdex")
+        picker = pokedex3.PokemonPicker(root, data_dir=data_dir, project_path=project_path)
+        pump()
+        cold_start = time.perf_counter() - start
+
+        keystrokes, filters = [], []
+        for _ in range(rounds):
+            for query in QUERIES:
+                picker.search_entry.delete(0, tk.END)
+                for i in range(1, len(query) + 1):
+                    picker.search_entry.insert(tk.END, query[i - 1])
+                    # The key handler itself, then the debounced grid filter
+                    keystrokes.append(timed(picker.schedule_search))
+                    filters.append(timed(picker.filter_pokemon_list_view))
+                    if picker.pending_search is not None:
+                        root.after_cancel(picker.pending_search)
+                        picker.pending_search = None
+        picker.search_entry.delete(0, tk.END)
+        picker.filter_pokemon_list_view()
+        pump()
+
+        rng = random.Random(1)
+        names = picker.pokedex.names()
+        clicks, hovers = [], []
+        for _ in range(rounds * 50):
+            label = picker.sprite_grid.labels()[0]
+            clicks.append(timed(picker.pick_pokemon, rng.choice(names), label))
+            name = rng.choice(names)
+            hovers.append(timed(lambda: (picker.display_pokemon_info_on_hover(name), picker.render_pending_hover())))
+        pump()
+
+        # Reopening the project the clicks were autosaved to
+        project_entries = len(picker.selected_pokemons)
+        reopen = timed(picker.open_project, project_path)
+        pump()
+
+    picker.on_close()
+    return {
+        "entries": len(picker.pokedex),
+        "tk": tk_mode,
+        "cold_start_ms": cold_start * 1000,
+        "keystroke": summarize(keystrokes),
+        "filter": summarize(filters),
+        "click": summarize(clicks),
+        "hover": summarize(hovers),
+        "project_entries": project_entries,
+        "project_reopen_ms": reopen * 1000,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def display_available():
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark picker startup and interactions")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--tk", choices=("auto", "real", "stub"), default="auto")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    # Used by the per-size child runs: data dir and the file to write results to
+    parser.add_argument("--run-size", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        data_dir, result_file = args.run_size
+        result = run_size(data_dir, args.tk, args.rounds)
+        with open(result_file, "w") as file:
+            json.dump(result, file)
+        return
+
+    tk_mode = args.tk
+    if tk_mode == "auto":
+        tk_mode = "real" if display_available() else "stub"
+
+    results = []
+    for size in map(int, args.sizes.split(",")):
+        work_dir = tempfile.mkdtemp(prefix=f"bench-picker-{size}-")
+        data_dir = os.path.join(work_dir, "data")
+        result_file = os.path.join(work_dir, "result.json")
+        try:
+            make_dataset(data_dir, size)
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-size", data_dir, result_file,
+                 "--tk", tk_mode, "--rounds", str(args.rounds)],
+                cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+            )
+            with open(result_file) as file:
+                results.append(json.load(file))
+        finally:
+            shutil.rmtree(work_dir)
+
+    print(f"{'entries':>8} {'start ms':>9} {'key p95':>8} {'filter p50':>10} {'filter p95':>10} "
+          f"{'click p95':>9} {'hover p95':>9} {'reopen ms':>9} {'RSS MB':>7}")
+    for result in results:
+        print(f"{result['entries']:>8} {result['cold_start_ms']:>9.0f} {result['keystroke']['p95_ms']:>8.2f} "
+              f"{result['filter']['median_ms']:>10.2f} {result['filter']['p95_ms']:>10.2f} "
+              f"{result['click']['p95_ms']:>9.2f} {result['hover']['p95_ms']:>9.2f} "
+              f"{result['project_reopen_ms']:>9.2f} {result['peak_rss_mb']:>7.0f}")
+    print(f"Tk: {tk_mode}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": sys.version.split()[0], "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
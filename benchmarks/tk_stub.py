@@ -0,0 +1,239 @@
+import sys
+import types
+
+# Headless stand-ins for the parts of tkinter (and PIL.ImageTk) the picker
+# uses, for benchmarking on machines without a display. Widgets remember
+# their options and text but draw nothing; the root keeps after() and
+# after_idle() callbacks in a queue that run_pending() drains, in place of
+# the Tk event loop. Timings taken with the stub measure the picker's own
+# Python code, not Tk's drawing.
+
+LEFT, RIGHT, TOP, BOTTOM = "left", "right", "top", "bottom"
+BOTH, X, Y = "both", "x", "y"
+WORD = "word"
+NORMAL, DISABLED = "normal", "disabled"
+END = "end"
+
+
+class TclError(Exception):
+    pass
+
+
+class Widget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.bindings = {}
+        self.text = ""
+
+    def pack(self, **options):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def pack_propagate(self, flag):
+        pass
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def cget(self, option):
+        return self.options.get(option, "")
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def lift(self):
+        pass
+
+    def withdraw(self):
+        pass
+
+    def tag_configure(self, tag, **options):
+        pass
+
+    def protocol(self, name, func):
+        self.bindings[name] = func
+
+    def title(self, text):
+        self.options["title"] = text
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_width(self):
+        return self.options.get("width", 200)
+
+    def winfo_height(self):
+        return self.options.get("height", 200)
+
+    def winfo_rootx(self):
+        return 0
+
+    def winfo_rooty(self):
+        return 0
+
+    def winfo_reqwidth(self):
+        return self.winfo_width()
+
+    # Entry / Text / Combobox content
+    def get(self, *args):
+        return self.text
+
+    def set(self, value):
+        self.text = value
+
+    def insert(self, index, text, *tags):
+        self.text = text + self.text if index == 0 else self.text + text
+
+    def delete(self, first, last=None):
+        self.text = ""
+
+
+class Tk(Widget):
+    def __init__(self):
+        super().__init__()
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func, *args):
+        self.next_id += 1
+        self.pending[self.next_id] = (func, args)
+        return self.next_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        # Run the queued callbacks, including the ones they queue, once
+        while self.pending:
+            after_id = min(self.pending)
+            func, args = self.pending.pop(after_id)
+            func(*args)
+
+    def update(self):
+        self.run_pending()
+
+    def mainloop(self):
+        self.run_pending()
+
+    def destroy(self):
+        self.pending.clear()
+
+
+class Canvas(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {}
+        self.top = 0.0
+        self.scrollregion = (0, 0, 0, 0)
+
+    def config(self, **options):
+        if "scrollregion" in options:
+            self.scrollregion = options["scrollregion"]
+        super().config(**options)
+
+    configure = config
+
+    def create_item(self, coords, options):
+        item = len(self.items) + 1
+        self.items[item] = [list(coords), dict(options)]
+        return item
+
+    def create_window(self, x, y, **options):
+        return self.create_item((x, y), options)
+
+    def create_rectangle(self, *coords, **options):
+        return self.create_item(coords, options)
+
+    def coords(self, item, *coords):
+        self.items[item][0] = list(coords)
+
+    def itemconfigure(self, item, **options):
+        self.items[item][1].update(options)
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def max_top(self):
+        return max(0.0, self.scrollregion[3] - self.winfo_height())
+
+    def yview(self, *args):
+        if args and args[0] == "moveto":
+            self.yview_moveto(float(args[1]))
+
+    def yview_moveto(self, fraction):
+        self.top = min(self.max_top(), fraction * self.scrollregion[3])
+
+    def yview_scroll(self, number, what):
+        self.top = max(0.0, min(self.max_top(), self.top + number * 10))
+
+
+class Scrollbar(Widget):
+    def set(self, *args):
+        pass
+
+
+class StringVar:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Style:
+    def theme_use(self, name=None):
+        pass
+
+    def configure(self, style, **options):
+        pass
+
+
+class PhotoImage:
+    def __init__(self, image=None, **options):
+        self.size = getattr(image, "size", (0, 0))
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+def install():
+    # Must run before pokedex3 (or anything importing tkinter) is imported
+    tkinter = types.ModuleType("tkinter")
+    ttk = types.ModuleType("tkinter.ttk")
+    for name in ("LEFT", "RIGHT", "TOP", "BOTTOM", "BOTH", "X", "Y", "WORD", "NORMAL",
+                 "DISABLED", "END", "TclError", "Tk", "Canvas", "Scrollbar", "StringVar"):
+        setattr(tkinter, name, globals()[name])
+    for name in ("Frame", "Label", "Text", "Toplevel"):
+        setattr(tkinter, name, type(name, (Widget,), {}))
+    for name in ("Entry", "Button", "Combobox", "Label"):
+        setattr(ttk, name, type(name, (Widget,), {}))
+    ttk.Style = Style
+    # Dialogs answer as if cancelled
+    filedialog = types.ModuleType("tkinter.filedialog")
+    filedialog.askopenfilename = lambda **options: ""
+    simpledialog = types.ModuleType("tkinter.simpledialog")
+    simpledialog.askstring = lambda *args, **options: None
+    tkinter.ttk = ttk
+    tkinter.filedialog = filedialog
+    tkinter.simpledialog = simpledialog
+    sys.modules["tkinter"] = tkinter
+    sys.modules["tkinter.ttk"] = ttk
+    sys.modules["tkinter.filedialog"] = filedialog
+    sys.modules["tkinter.simpledialog"] = simpledialog
+
+    from PIL import ImageTk
+    ImageTk.PhotoImage = PhotoImage
@@ -0,0 +1,152 @@
+import tkinter as tk
+from PIL import Image, ImageTk
+
+from pokedex_core import instrument
+
+# Define abbreviations for stat names, in display order
+STAT_ABBREVIATIONS = {
+    "hp": "HP",
+    "attack": "ATK",
+    "defense": "DEF",
+    "special-attack": "SpATK",
+    "special-defense": "SpDEF",
+    "speed": "SPE",
+}
+
+STAT_COLORS = {
+    "hp": "green",
+    "attack": "red",
+    "defense": "orange",
+    "special-attack": "pink",
+    "special-defense": "blue",
+    "speed": "cyan",
+}
+
+# Define a maximum value for stats to normalize the bar length
+MAX_STAT_VALUE = 150
+
+TYPE_ICON_SIZE = (80, 20)
+
+# Most Pokémon have at most two types, extra icon labels are created on demand
+TYPE_ICON_SLOTS = 2
+
+
+def get_stat_color(stat):
+    # Return a color based on the stat name
+    return STAT_COLORS.get(stat.lower(), "grey")
+
+
+class DetailsPanel:
+    # The details side panel. All widgets are created once and updated in
+    # place, type icons are resized once and cached, and bars are redrawn by
+    # moving the existing rectangle instead of rebuilding the canvas.
+    def __init__(self, parent, bg=None, icon_dir="data/images/types"):
+        self.parent = parent
+        self.icon_dir = icon_dir
+        self.type_icons = {}
+
+        # Set up font styles
+        title_font = ("Arial", 14, "bold")
+
+        # Text details (name and abilities)
+        self.text = tk.Text(parent, wrap=tk.WORD, bg=bg, height=12, state=tk.DISABLED)
+        self.text.tag_configure("name", font=title_font)
+        self.text.pack(side=tk.TOP, fill=tk.BOTH, padx=5, pady=5)
+
+        # Type icons
+        self.types_frame = tk.Frame(parent)
+        self.types_frame.pack(pady=5)
+        self.type_labels = []
+        for _ in range(TYPE_ICON_SLOTS):
+            self.add_type_label()
+
+        # One row per stat: abbreviation, bar and value
+        self.stat_rows = {}
+        for stat, abbrev in STAT_ABBREVIATIONS.items():
+            stat_frame = tk.Frame(parent)
+            stat_frame.pack(fill=tk.X, padx=5, pady=2)
+            tk.Label(stat_frame, text=abbrev.capitalize(), width=6, anchor="w").pack(side=tk.LEFT)
+
+            value_label = tk.Label(stat_frame, text="", width=4, anchor="e")
+            value_label.pack(side=tk.RIGHT)
+
+            canvas = tk.Canvas(stat_frame, height=10, bg="white")
+            canvas.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            bar = canvas.create_rectangle(0, 0, 0, 10, fill=get_stat_color(stat), outline="")
+            canvas.value = 0
+            # Resizing the panel rescales the bar without re-rendering
+            canvas.bind("<Configure>", lambda event, canvas=canvas, bar=bar: self.draw_bar(canvas, bar))
+
+            self.stat_rows[stat] = (canvas, bar, value_label)
+
+        # Base Stat Total
+        bst_frame = tk.Frame(parent)
+        bst_frame.pack(fill=tk.X, padx=5, pady=5)
+        tk.Label(bst_frame, text="Total", width=6, anchor="w").pack(side=tk.LEFT)
+        self.bst_label = tk.Label(bst_frame, text="", anchor="e")
+        self.bst_label.pack(side=tk.RIGHT)
+
+    def add_type_label(self):
+        label = tk.Label(self.types_frame)
+        self.type_labels.append(label)
+        return label
+
+    def get_type_icon(self, type_name):
+        if type_name not in self.type_icons:
+            type_img_path = f"{self.icon_dir}/{type_name.capitalize()}.png"
+            try:
+                with instrument.timer("details.type_icon_decode"):
+                    type_img = Image.open(type_img_path)
+                    type_img = type_img.resize(TYPE_ICON_SIZE, Image.LANCZOS)
+                    self.type_icons[type_name] = ImageTk.PhotoImage(type_img)
+            except FileNotFoundError:
+                print(f"Type icon not found: {type_img_path}")
+                self.type_icons[type_name] = None
+        return self.type_icons[type_name]
+
+    def show(self, details, stats):
+        lines = details.split("\n")
+
+        # Name first, then the abilities info
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, lines[0] + "\n", "name")
+        for info in lines[2:]:
+            self.text.insert(tk.END, info + "\n", "content")
+        self.text.config(state=tk.DISABLED)  # Make the text widget read-only
+
+        pokemon_types = lines[1].replace("Types: ", "").split(", ") if len(lines) > 1 else []
+        pokemon_types = [type_name for type_name in pokemon_types if type_name]
+        self.show_types(pokemon_types)
+        self.show_stats(stats)
+
+    def show_types(self, pokemon_types):
+        icons = [icon for icon in map(self.get_type_icon, pokemon_types) if icon is not None]
+        while len(self.type_labels) < len(icons):
+            self.add_type_label()
+
+        for i, label in enumerate(self.type_labels):
+            if i < len(icons):
+                label.config(image=icons[i])
+                label.pack(side=tk.LEFT, padx=2)
+            else:
+                label.pack_forget()
+
+    def show_stats(self, stats):
+        for stat, (canvas, bar, value_label) in self.stat_rows.items():
+            value = stats.get(stat, 0)
+            canvas.value = value
+            value_label.config(text=f"{value}" if stat in stats else "")
+            self.draw_bar(canvas, bar)
+
+        # Calculate the total of all stats (BST)
+        self.bst_label.config(text=f"{sum(stats.values())}" if stats else "")
+
+    def draw_bar(self, canvas, bar):
+        # Before the first layout pass winfo_width is 1, fall back to the
+        # requested width so no update_idletasks() round trip is needed
+        width = canvas.winfo_width()
+        if width <= 1:
+            width = canvas.winfo_reqwidth()
+        bar_length = min(canvas.value / MAX_STAT_VALUE, 1) * width
+        canvas.coords(bar, 0, 0, bar_length, 10)
@@ -1,42 +1,60 @@
-import requests
-import json
-import concurrent.futures
-
-def fetch_all_abilities():
-    url = "https://pokeapi.co/api/v2/ability?limit=10000"  # High limit to ensure fetching all abilities
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        return [ability['name'] for ability in data['results']]
-    return []
-
-def fetch_ability_details(ability_name):
-    response = requests.get(f"https://pokeapi.co/api/v2/ability/{ability_name}")
-    if response.status_code == 200:
-        data = response.json()
+from functools import partial
+import sys
+
+from pokedex_core.ability_texts import write_ability_shards
+from pokedex_core.json_io import write_json_object
+from fetch_common import Checkpoint, FetchError, Fetcher
+
+def fetch_all_abilities(fetcher):
+    return [ability['name'] for ability in fetcher.list_resources("ability")]
+
+def fetch_ability_details(ability_name, fetcher):
+    data = fetcher.get_json(f"ability/{ability_name}")
+    if data is not None:
         flavor_texts = {}
         for flavor_text_entry in data["flavor_text_entries"]:
             language = flavor_text_entry["language"]["name"]
             flavor_text = flavor_text_entry["flavor_text"]
             flavor_texts[language] = flavor_text
         return flavor_texts
-    return {}
+    return None
+
+def cache_abilities(abilities, fetcher):
+    # Abilities are fetched concurrently, then written back in listing order
+    checkpoint = Checkpoint("abilities_flavor_text")
+    missing = [ability for ability in abilities if ability not in checkpoint]
+    try:
+        for ability, flavor_texts in fetcher.map(partial(fetch_ability_details, fetcher=fetcher), missing):
+            if flavor_texts is not None:
+                checkpoint.add(ability, flavor_texts)
+    finally:
+        checkpoint.save()
 
-def cache_abilities(abilities):
-    ability_flavor_texts = {}
-    for ability in abilities:
-        flavor_texts = fetch_ability_details(ability)
-        ability_flavor_texts[ability] = flavor_texts
+    missing = [ability for ability in abilities if ability not in checkpoint]
+    if missing:
+        # The previous files stay until a run fetches everything
+        print(f"{len(missing)} abilities could not be fetched, abilities_flavor_text.json left unchanged, run again to retry them")
+        return False
 
-    with open('data/abilities_flavor_text.json', 'w') as file:
-        json.dump(ability_flavor_texts, file, indent=4)
+    # Compact the journal into the canonical file, in listing order
+    fetched = dict(checkpoint.items())
+    ability_flavor_texts = {ability: fetched[ability] for ability in abilities}
+    write_json_object('data/abilities_flavor_text.json', ability_flavor_texts.items())
+    # Per-language files the GUI loads on demand
+    write_ability_shards(ability_flavor_texts)
+    checkpoint.discard()
+    return True
 
 def main():
-    all_abilities = fetch_all_abilities()
-    if all_abilities:
-        cache_abilities(all_abilities)
-    else:
-        print("Failed to fetch abilities.")
+    with Fetcher() as fetcher:
+        try:
+            all_abilities = fetch_all_abilities(fetcher)
+        except FetchError as e:
+            print(f"Failed to fetch abilities: {e}")
+            return 1
+        if not cache_abilities(all_abilities, fetcher):
+            return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
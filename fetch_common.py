@@ -0,0 +1,287 @@
+import requests
+from requests.adapters import HTTPAdapter
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+
+from pokedex_core import instrument
+from pokedex_core.json_io import load_json_file, write_json_atomic
+
+# Point the fetch scripts at another server (e.g. a local stand-in serving
+# fixture JSON) with POKEAPI_BASE_URL
+BASE_URL = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2").rstrip("/")
+CONCURRENCY = int(os.environ.get("POKEAPI_CONCURRENCY", "20"))
+# Maximum requests per second across all workers, 0 disables the limit
+RATE_LIMIT = float(os.environ.get("POKEAPI_RATE_LIMIT", "50"))
+MAX_RETRIES = int(os.environ.get("POKEAPI_MAX_RETRIES", "4"))
+BACKOFF_SECONDS = 0.5
+TIMEOUT_SECONDS = 30
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Page size used when walking the paginated list endpoints
+LIST_PAGE_SIZE = 500
+
+# Responses are cached on disk; entries younger than the max age are reused
+# without contacting the server, older ones are revalidated with
+# If-None-Match / If-Modified-Since
+CACHE_DIR = os.environ.get("POKEAPI_CACHE_DIR", "data/.http_cache")
+CACHE_MAX_AGE = float(os.environ.get("POKEAPI_CACHE_MAX_AGE", str(24 * 3600)))
+CHECKPOINT_DIR = "data/.checkpoints"
+
+
+class FetchError(Exception):
+    # A resource listing could not be fetched completely
+    pass
+
+
+def resource_id(url):
+    # ".../pokemon/10034/" -> 10034
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+
+class HTTPCache:
+    # One JSON file per URL holding the body and its validators
+    def __init__(self, cache_dir=CACHE_DIR, max_age=CACHE_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+
+    def path(self, url):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def load(self, url):
+        entry = load_json_file(self.path(url))
+        return entry if entry and entry.get("url") == url else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.max_age
+
+    def validators(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, response, body):
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": body,
+        }
+        write_json_atomic(self.path(url), entry)
+
+    def touch(self, entry):
+        entry["fetched_at"] = time.time()
+        write_json_atomic(self.path(entry["url"]), entry)
+
+
+class Checkpoint:
+    # Records of a long fetch, appended to an NDJSON journal
+    # (data/.checkpoints/<name>.ndjson, one [key, record] line each) as soon
+    # as they arrive. An interrupted refresh resumes from the journal instead
+    # of starting over, and the journal is usable as partial output. Only the
+    # keys and their line offsets are kept in memory; records are read back
+    # from disk when the final file is compacted.
+    def __init__(self, name, checkpoint_dir=CHECKPOINT_DIR):
+        self.path = os.path.join(checkpoint_dir, f"{name}.ndjson")
+        self.offsets = {}  # key -> offset of its latest line in the journal
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self.scan()
+        self.file = open(self.path, "a", encoding="utf-8")
+        if self.offsets:
+            print(f"Resuming from checkpoint {self.path} ({len(self.offsets)} entries)")
+
+    def scan(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            offset = 0
+            for line in file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    key, _ = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted run, drop it and
+                    # everything after it
+                    break
+                self.offsets[key] = offset
+                offset += len(line)
+        with open(self.path, "r+b") as file:
+            file.truncate(offset)
+
+    def __contains__(self, key):
+        return str(key) in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def keys(self):
+        return list(self.offsets)
+
+    def add(self, key, value):
+        self.offsets[str(key)] = self.file.tell()
+        self.file.write(json.dumps([str(key), value], separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def items(self, keys=None):
+        # (key, record) pairs read back from the journal, in the given key
+        # order (journal order by default), one record in memory at a time
+        self.file.flush()
+        with open(self.path, "rb") as file:
+            for key in self.offsets if keys is None else keys:
+                file.seek(self.offsets[key])
+                yield key, json.loads(file.readline())[1]
+
+    def save(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def discard(self):
+        # Called once the final output has been compacted
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RateLimiter:
+    # Token bucket shared by all worker threads
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+class Fetcher:
+    # One keep-alive connection pool shared by every request of a refresh,
+    # with retries, exponential backoff and a global rate limit
+    def __init__(self, base_url=BASE_URL, concurrency=CONCURRENCY, rate_limit=RATE_LIMIT,
+                 max_retries=MAX_RETRIES, cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.cache = cache if cache is not None else HTTPCache()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path):
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, headers=None):
+        url = self.url(path)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                with instrument.timer("http.request"):
+                    response = self.session.get(url, headers=headers, timeout=TIMEOUT_SECONDS)
+            except requests.RequestException as e:
+                instrument.count("http.errors")
+                if attempt == self.max_retries:
+                    raise
+                print(f"Retrying {url} after error: {e}")
+                time.sleep(BACKOFF_SECONDS * 2 ** attempt)
+                continue
+
+            instrument.count(f"http.status.{response.status_code}")
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            instrument.count("http.retries")
+
+            # Honour Retry-After on 429/503 when the server sends one
+            retry_after = response.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else BACKOFF_SECONDS * 2 ** attempt
+            time.sleep(delay)
+
+    def get_json(self, path):
+        # Parsed JSON body, or None for any non-200 response. Goes through
+        # the on-disk cache unless the Fetcher was created with cache=False.
+        url = self.url(path)
+        cached = self.cache.load(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            instrument.count("http.cache.fresh")
+            return cached["body"]
+
+        response = self.get(url, headers=self.cache.validators(cached) if cached else None)
+        if response.status_code == 304 and cached:
+            instrument.count("http.cache.revalidated")
+            self.cache.touch(cached)
+            return cached["body"]
+        instrument.count("http.cache.miss")
+        if response.status_code != 200:
+            print(f"Error fetching {response.url}: HTTP Status {response.status_code}")
+            return None
+
+        body = response.json()
+        if self.cache:
+            self.cache.store(url, response, body)
+        return body
+
+    def list_resources(self, endpoint):
+        # Every {"name", "url"} entry of a list endpoint such as "pokemon"
+        # or "evolution-chain", following the "next" links page by page.
+        # Raises FetchError when a page fails or the listing comes back
+        # empty or short, so callers never mistake it for the full list.
+        resources = []
+        url = f"{endpoint}?limit={LIST_PAGE_SIZE}"
+        expected = None
+        while url:
+            page = self.get_json(url)
+            if page is None:
+                raise FetchError(f"Could not fetch the {endpoint} listing page {self.url(url)}")
+            expected = page.get("count", expected)
+            resources.extend(page["results"])
+            url = page.get("next")
+        if not resources or (expected is not None and len(resources) < expected):
+            raise FetchError(f"The {endpoint} listing returned {len(resources)} of {expected} entries")
+        return resources
+
+    def list_ids(self, endpoint):
+        return sorted(resource_id(resource["url"]) for resource in self.list_resources(endpoint))
+
+    def map(self, func, items):
+        # Run func(item) for every item on the worker pool, yielding
+        # (item, result) pairs as they complete. Each future is dropped once
+        # yielded, so results don't pile up in memory while the rest run.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(func, item): item for item in items}
+            for future in concurrent.futures.as_completed(futures):
+                item = futures.pop(future)
+                yield item, future.result()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,56 +1,71 @@
-import requests
-import json
-import concurrent.futures
+from functools import partial
+import sys
 
-def fetch_evolution_chain(chain_id):
+from fetch_common import Checkpoint, FetchError, Fetcher
+from pokedex_core.json_io import write_json_object
+
+def fetch_evolution_chain(chain_id, fetcher):
     try:
-        response = requests.get(f"https://pokeapi.co/api/v2/evolution-chain/{chain_id}/")
-        response.raise_for_status()
-        data = response.json()
-
-        def extract_chain(chain):
-            if not chain:
-                return [], []
-            
-            current_species = chain['species']['name']
-            if not chain['evolves_to']:
-                return [current_species], [current_species]
+        data = fetcher.get_json(f"evolution-chain/{chain_id}/")
+        if data is None:
+            return None
+
+        # Walk the chain depth first: members in preorder, one
+        # [parent, child] edge per evolution, final forms in the order they
+        # are reached, so the same chain always produces the same record
+        full_chain, final_forms, edges = [], [], []
 
-            full_chain = [current_species]
-            final_forms = []
+        def extract_chain(chain, parent=None):
+            species = chain['species']['name']
+            full_chain.append(species)
+            if parent is not None:
+                edges.append([parent, species])
+            if not chain['evolves_to']:
+                final_forms.append(species)
             for next_chain in chain['evolves_to']:
-                sub_finals, sub_chain = extract_chain(next_chain)
-                final_forms.extend(sub_finals)
-                full_chain.extend(sub_chain)
-            
-            return list(set(final_forms)), full_chain
+                extract_chain(next_chain, species)
 
-        final_forms, full_chain = extract_chain(data['chain'])
-        return {full_chain[0]: {"final_forms": final_forms, "full_chain": full_chain}}
+        extract_chain(data['chain'])
+        return {full_chain[0]: {"final_forms": final_forms, "full_chain": full_chain, "edges": edges}}
 
     except Exception as e:
         print(f"Error fetching evolution chain for ID {chain_id}: {e}")
-        return {}
+        return None
 
 
 def fetch_all_evolution_chains():
-    # Fetching a large number of evolution chains
-    chain_ids = range(1, 600)
-    all_chains = {}
-
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [executor.submit(fetch_evolution_chain, chain_id) for chain_id in chain_ids]
+    # Chains fetched by an earlier, interrupted run are not requested again
+    checkpoint = Checkpoint("evolution_chains")
+    failed = 0
 
-        for future in concurrent.futures.as_completed(futures):
-            chain_id = futures.index(future) + 1
-            evolution_chain = future.result()
-            if evolution_chain:
-                all_chains[chain_id] = evolution_chain
+    with Fetcher() as fetcher:
+        # Only the chain ids that actually exist (they have gaps)
+        try:
+            chain_ids = [chain_id for chain_id in fetcher.list_ids("evolution-chain") if chain_id not in checkpoint]
+        except FetchError as e:
+            print(f"{e}, evolution_chains.json left unchanged")
+            checkpoint.save()
+            return 1
+        try:
+            results = fetcher.map(partial(fetch_evolution_chain, fetcher=fetcher), chain_ids)
+            for chain_id, evolution_chain in results:
+                if evolution_chain:
+                    checkpoint.add(chain_id, evolution_chain)
+                else:
+                    failed += 1
+        finally:
+            checkpoint.save()
 
-    with open('data/evolution_chains.json', 'w') as f:
-        json.dump(all_chains, f, indent=4)
+    if failed:
+        # The previous chains file stays until a run fetches everything
+        print(f"{failed} evolution chains could not be fetched, evolution_chains.json left unchanged, run again to retry them")
+        return 1
 
+    # Compact the journal into the canonical file, in chain id order
+    write_json_object('data/evolution_chains.json', checkpoint.items(sorted(checkpoint.keys(), key=int)))
+    checkpoint.discard()
     print("Fetched all evolution chains.")
+    return 0
 
 if __name__ == "__main__":
-    fetch_all_evolution_chains()
+    sys.exit(fetch_all_evolution_chains())
@@ -1,16 +1,18 @@
-import requests
-import json
-import concurrent.futures
+from functools import partial
+import sys
 
-def fetch_pokemon_data(pokemon_id):
+from fetch_common import Checkpoint, FetchError, Fetcher
+from pokedex_core.json_io import write_json_array
+
+def fetch_pokemon_data(pokemon_id, fetcher):
     try:
-        response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}")
-        if response.status_code == 200:
-            pokemon = response.json()
+        pokemon = fetcher.get_json(f"pokemon/{pokemon_id}")
+        if pokemon is not None:
             normal_abilities = [ability['ability']['name'] for ability in pokemon['abilities'] if not ability['is_hidden']]
             hidden_abilities = [ability['ability']['name'] for ability in pokemon['abilities'] if ability['is_hidden']]
 
             pokemon_data = {
+                "id": pokemon['id'],
                 "name": pokemon['name'],
                 "types": [ptype['type']['name'] for ptype in pokemon['types']],
                 "normal_abilities": normal_abilities,
@@ -19,7 +21,6 @@ def fetch_pokemon_data(pokemon_id):
             }
             return pokemon_data
         else:
-            print(f"Error fetching data for Pokémon ID {pokemon_id}: HTTP Status {response.status_code}")
             return None
     except Exception as e:
         print(f"Exception fetching data for Pokémon ID {pokemon_id}: {e}")
@@ -27,26 +28,44 @@ def fetch_pokemon_data(pokemon_id):
 
 
 def main():
-    total_pokemon = 1025  # Adjust this number based on the total count of Pokémon
-    pokemon_data_dict = {}
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(fetch_pokemon_data, i): i for i in range(1, total_pokemon + 1)}
-        for future in concurrent.futures.as_completed(futures):
-            pokemon_id = futures[future]
-            pokemon_data = future.result()
-            if pokemon_data:
-                pokemon_data_dict[pokemon_id] = pokemon_data
+    # Entries fetched by an earlier, interrupted run are not requested again
+    checkpoint = Checkpoint("pokemon_data")
+    failed = 0
 
-    # Sort the data by National Pokédex number (which is the key in the dictionary)
-    sorted_pokemon_list = [pokemon_data_dict[id] for id in sorted(pokemon_data_dict)]
+    with Fetcher() as fetcher:
+        # Species and alternate forms (10001+) as listed by the API
+        try:
+            pokemon_ids = [i for i in fetcher.list_ids("pokemon") if i not in checkpoint]
+        except FetchError as e:
+            # Keep the existing data file rather than replace it with a
+            # partial list
+            print(f"{e}, pokemon_data_sorted.json left unchanged")
+            checkpoint.save()
+            return 1
+        try:
+            results = fetcher.map(partial(fetch_pokemon_data, fetcher=fetcher), pokemon_ids)
+            for pokemon_id, pokemon_data in results:
+                if pokemon_data:
+                    checkpoint.add(pokemon_id, pokemon_data)
+                else:
+                    failed += 1
+        finally:
+            checkpoint.save()
 
-    # Save the data to a JSON file
-    with open('data/pokemon_data_sorted.json', 'w') as file:
-        json.dump(sorted_pokemon_list, file)
+    if failed:
+        # The previous data file stays until a run fetches everything; the
+        # checkpoint holds what this one got
+        print(f"{failed} Pokémon could not be fetched, pokemon_data_sorted.json left unchanged, run again to retry them")
+        return 1
 
+    # Compact the journal into the canonical file, sorted by National
+    # Pokédex number (the checkpoint key), alternate forms after the last
+    # species. Records are streamed from the journal one at a time.
+    sorted_ids = sorted(checkpoint.keys(), key=int)
+    write_json_array('data/pokemon_data_sorted.json', (record for _, record in checkpoint.items(sorted_ids)))
+    checkpoint.discard()
     print("Data fetching complete and saved to pokemon_data_sorted.json")
+    return 0
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
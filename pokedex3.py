@@ -1,31 +1,117 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, simpledialog, ttk
 from PIL import Image, ImageTk
+from collections import OrderedDict
+import argparse
 import json
 
+from details_panel import DetailsPanel
+from pokedex_core import (
+    AbilityTextStore,
+    PokedexStore,
+    SearchIndex,
+    Selection,
+    SelectionAnalytics,
+    instrument,
+    open_dataset,
+)
+from pokedex_core.matchups import TypeMatchups
+from pokedex_core.export import write_json_export, write_plain_list
+from pokedex_core.project import DEFAULT_PROJECT, PROJECT_EXTENSION, Project
+from pokedex_core.sprites import load_sprite_manifest
+from pokedex_core.stats import StatsTable
+from sprite_grid import VirtualSpriteGrid
+from sprite_loader import SpriteLoader
+
+# Decoded sprites kept around for labels scrolling back into view
+SPRITE_CACHE_SIZE = 300
+
+# Rows above and below the view whose sprites are decoded ahead of time
+PREFETCH_ROWS = 3
+
+# Top search results whose sprites are decoded while the user is typing
+SEARCH_PREFETCH = 30
+
+# Shown in the empty search bar until it gets focus
+SEARCH_PLACEHOLDER = "Search by name"
+
+# Delay after the last keystroke before the grid is filtered
+SEARCH_DEBOUNCE_MS = 120
+
+# Sort menu labels -> pokedex_core.stats column, None keeps dex order
+SORT_OPTIONS = {
+    "Dex No.": None,
+    "HP": "hp",
+    "ATK": "atk",
+    "DEF": "def",
+    "SpATK": "spa",
+    "SpDEF": "spd",
+    "SPE": "spe",
+    "BST": "bst",
+}
+
 class PokemonPicker:
-    def __init__(self, root):
+    def __init__(self, root, data_dir="data", project_path=DEFAULT_PROJECT):
         # Initialize the main window and bind the mousewheel event
         self.root = root
+        self.data_dir = data_dir
         self.root.title("Regional Pokédex Maker")
         root.bind("<MouseWheel>", self.on_mousewheel)
 
-        # Load data from JSON files
-        self.pokemon_data = self.load_json_data("data/pokemon_data_sorted.json")
-        self.ability_flavor_texts = self.load_json_data("data/abilities_flavor_text.json")
-        self.evolution_chains = self.load_json_data("data/evolution_chains.json")
+        # Load data from the compiled dataset, or from the JSON files when it
+        # is missing or out of date. Ability flavor texts are only loaded for
+        # the UI language, when first displayed.
+        with instrument.timer("picker.load.store"):
+            self.dataset = open_dataset(data_dir)
+            if self.dataset is not None:
+                self.pokedex = PokedexStore.from_dataset(self.dataset)
+            else:
+                self.pokedex = PokedexStore(
+                    self.load_json_data(f"{data_dir}/pokemon_data_sorted.json"),
+                    self.load_json_data(f"{data_dir}/evolution_chains.json"),
+                )
+        # Every sprite on disk, so missing ones are known up front; alternate
+        # forms that only exist as sprites become grid entries of their own
+        with instrument.timer("picker.load.sprite_manifest"):
+            self.sprite_manifest = load_sprite_manifest(
+                f"{data_dir}/images/pokemons", f"{data_dir}/images/sprite_manifest.json"
+            )
+            self.pokedex.add_forms(self.sprite_manifest.forms())
+        self.ability_texts = AbilityTextStore(data_dir, dataset=self.dataset)
+        with instrument.timer("picker.load.search_index"):
+            self.search_index = SearchIndex(self.pokedex)
+        with instrument.timer("picker.load.stats_table"):
+            self.stats_table = StatsTable(self.pokedex)
+        with instrument.timer("picker.load.type_matchups"):
+            self.type_matchups = TypeMatchups(self.pokedex)
 
         # Set up initial state
         self.show_full_list = True
-        self.selected_pokemons = []
+        self.selected_pokemons = Selection()
+        self.selected_pokemons.subscribe(self.on_selection_changed)
+        self.analytics = SelectionAnalytics(self.pokedex, self.selected_pokemons)
+        self.analytics.subscribe(self.schedule_balance_report)
+        # Type matchups of the selection, for the balance window
+        self.coverage = self.type_matchups.coverage(selection=self.selected_pokemons)
+        self.balance_window = None
+        self.pending_balance_report = False
         self.selected_pokemon = tk.StringVar()
         self.show_final_evolutions_only = False
         self.final_evolution_filter_query = ""
-        self.final_evolutions = self.load_final_evolutions()
+        self.pending_search = None
+        self.pending_hover = None
+        self.details_pokemon = None
+        self.search_prefetch = []
+        self.project = None
         # Create and style the widgets
         self.create_widgets()
         self.style_widgets()
 
+        # The saved dexes; every selection change is autosaved to the
+        # project's journal, and closing the window compacts it
+        self.open_project(project_path)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def load_json_data(self, filename):
         try:
             with open(filename, "r") as file:
@@ -38,127 +124,247 @@ class PokemonPicker:
             return []
 
     def generate_json(self):
-        highlighted_pokemons_dict = {"highlighted_pokemons": self.selected_pokemons}
-        json_data = json.dumps(highlighted_pokemons_dict, indent=2)
-
-        try:
-            with open("highlighted_pokemons.json", "w") as json_file:
-                json_file.write(json_data)
-        except Exception as e:
-            print(f"Error saving JSON file: {e}")
+        # Exports follow the regional numbering
+        write_json_export(self.project.active_dex().order)
 
     def generate_plain_list(self):
-        plain_list = []
-        for pokemon_name in self.selected_pokemons:
-            # Find the Pokémon data in the loaded JSON data
-            pokemon_data = next((pokemon for pokemon in self.pokemon_data if pokemon['name'] == pokemon_name), None)
-            if pokemon_data:
-                pokemon_types = ", ".join(pokemon_data['types'])
-                plain_list.append(f"{pokemon_name} - Types: {pokemon_types}")
-            else:
-                plain_list.append(f"{pokemon_name} - Types: Unknown")
-
-        try:
-            with open("selected_pokemons.txt", "w") as txt_file:
-                txt_file.write("\n".join(plain_list))
-        except Exception as e:
-            print(f"Error saving plain list file: {e}")
+        write_plain_list(self.pokedex, self.project.active_dex().order)
 
 
     def on_mousewheel(self, event):
-        self.canvas.yview_scroll(-1 * (event.delta // 120), "units")
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self.sprite_grid.scroll(-1 * (event.delta // 120))
 
 
+    @instrument.timed("picker.pick_pokemon")
     def pick_pokemon(self, selected_pokemon_name, label):
         already_selected = selected_pokemon_name in self.selected_pokemons
-        if already_selected:
-            self.selected_pokemons.remove(selected_pokemon_name)
-        else:
-            self.selected_pokemons.append(selected_pokemon_name)
 
+        # In final evolutions mode the whole evolution chain is (de)selected
+        members = [selected_pokemon_name]
         if self.show_final_evolutions_only:
-            for base_form, evolution_info in self.evolution_chains.items():
-                for evolution_detail in evolution_info.values():
-                    if selected_pokemon_name in evolution_detail['full_chain']:
-                        # Select or deselect all Pokémon in the evolution chain
-                        for pokemon_name in evolution_detail['full_chain']:
-                            if already_selected and pokemon_name in self.selected_pokemons:
-                                self.selected_pokemons.remove(pokemon_name)
-                            elif not already_selected and pokemon_name not in self.selected_pokemons:
-                                self.selected_pokemons.append(pokemon_name)
-
-        # Update UI for each Pokémon label
-        for label in self.pokemon_labels:
-            if label["text"].lower() in self.selected_pokemons:
-                label.config(bd=3, relief="solid")
-            else:
-                label.config(bd=3, relief="flat")
+            members += self.pokedex.chain_members(selected_pokemon_name)
+
+        # The selection reports what changed to on_selection_changed
+        if already_selected:
+            self.selected_pokemons.difference_update(members)
+        else:
+            self.selected_pokemons.update(members)
 
         # Fetch details for the selected Pokémon and display them
         details, stats = self.fetch_pokemon_details(selected_pokemon_name)
         print(f"Details fetched for {selected_pokemon_name}: {details}")  # Debug print
         self.display_pokemon_details(details, stats)
 
-        # Update the selected count
+    def on_selection_changed(self, added, removed):
+        if self.project is not None:
+            dex = self.project.active_dex()
+            dex.entries.update(added)
+            dex.entries.difference_update(removed)
+        # Only the labels whose selection state flipped are restyled, unless
+        # the picked view shows regional numbers that may have shifted
+        if self.show_full_list:
+            self.sprite_grid.restyle(set(added).union(removed))
+        else:
+            self.sprite_grid.redraw()
         self.update_selected_count()
 
+    def can_reorder(self):
+        # Dragging renumbers the dex only when the grid shows all of it in
+        # regional order
+        return (
+            not self.show_full_list
+            and SORT_OPTIONS.get(self.sort_box.get()) is None
+            and len(self.sprite_grid.entries) == len(self.project.active_dex().order)
+        )
 
+    @instrument.timed("picker.move_picked")
+    def move_picked(self, pokemon_name, old, new):
+        if not self.can_reorder():
+            print("Clear the search, filters and sort to reorder the regional dex")
+            return
+        self.project.move(pokemon_name, new)
+        self.sprite_grid.move_entry(old, new)
+
+    @instrument.timed("picker.open_project")
+    def open_project(self, path):
+        if self.project is not None:
+            self.project.close()
+        self.project = None
+        project = None
+        for candidate in dict.fromkeys([path, DEFAULT_PROJECT]):
+            try:
+                project = Project(candidate)
+                break
+            except (OSError, ValueError) as e:
+                print(f"Error opening project {candidate}: {e}")
+        if project is None:
+            # Neither file is usable; work in memory rather than not start
+            project = Project(None)
+        self.project = project
+        self.root.title(f"Regional Pokédex Maker - {project.path or 'unsaved project'}")
+        self.show_dex(project.active)
+
+    def show_dex(self, name):
+        # The dex's entries become the selection in one batch, so the grid
+        # is restyled once however many entries it has
+        self.project.set_active(name)
+        self.selected_pokemons.replace(self.project.active_dex().order)
+        self.dex_box.config(values=self.project.names())
+        self.dex_box.set(name)
+        if not self.show_full_list:
+            self.filter_pokemon_list_view()
+
+    def change_dex(self, event=None):
+        self.show_dex(self.dex_box.get())
+
+    def new_dex(self):
+        name = simpledialog.askstring("New Dex", "Name of the new dex:", parent=self.root)
+        if not name or not name.strip():
+            return
+        try:
+            self.project.create_dex(name.strip())
+        except ValueError as e:
+            print(e)
+            return
+        self.show_dex(name.strip())
+
+    def choose_project(self):
+        # A .pdex project, or a JSON export to add as a dex of this project
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            filetypes=[("Dex projects", f"*{PROJECT_EXTENSION}"), ("JSON exports", "*.json")],
+        )
+        if not path:
+            return
+        if path.endswith(".json"):
+            dex = self.project.import_export(path)
+            if dex is not None:
+                self.show_dex(dex.name)
+        else:
+            self.open_project(path)
+
+    def edit_note(self):
+        name = self.details_pokemon
+        if name not in self.pokedex:
+            return
+        dex = self.project.active_dex()
+        text = simpledialog.askstring(
+            "Note", f"Note for {name.capitalize()}:", initialvalue=dex.notes.get(name, ""), parent=self.root
+        )
+        if text is not None:
+            self.project.set_note(name, text)
+            self.display_pokemon_details(*self.fetch_pokemon_details(name))
+
+    def on_close(self):
+        self.project.close()
+        self.sprite_loader.close()
+        self.root.destroy()
+
+    def show_balance_window(self):
+        # Live type distribution, stat averages and stage counts of the selection
+        if self.balance_window is None or not self.balance_window.winfo_exists():
+            self.balance_window = tk.Toplevel(self.root)
+            self.balance_window.title("Dex Balance")
+            self.balance_text = tk.Text(self.balance_window, width=40, height=30, font=("Courier", 10))
+            self.balance_text.pack(fill=tk.BOTH, expand=True)
+        self.balance_window.lift()
+        self.update_balance_report()
+
+    def schedule_balance_report(self, analytics):
+        # Several selection changes in one event only redraw the report once
+        if self.balance_window is not None and not self.pending_balance_report:
+            self.pending_balance_report = True
+            self.root.after_idle(self.update_balance_report)
+
+    def update_balance_report(self):
+        self.pending_balance_report = False
+        if self.balance_window is None or not self.balance_window.winfo_exists():
+            return
+        self.balance_text.config(state=tk.NORMAL)
+        self.balance_text.delete("1.0", tk.END)
+        self.balance_text.insert(tk.END, self.analytics.report() + "\n\n" + self.coverage.report())
+        self.balance_text.config(state=tk.DISABLED)
+
+    def select_filtered(self):
+        # Select everything the current search/filter shows in one batch
+        self.selected_pokemons.update(self.sprite_grid.entries)
+
+    def invert_selection(self):
+        self.selected_pokemons.invert(self.sprite_grid.entries)
 
-    def process_evolution_chains(self, evolution_chains):
-        final_evolutions = {}
-        for chain in evolution_chains.values():
-            for base_form, details in chain.items():
-                # Add final forms for each Pokémon in the full chain
-                for pokemon in details["full_chain"]:
-                    final_evolutions[pokemon] = details["final_forms"]
-        return final_evolutions
-
-
-
-
-    def extract_final_forms(self, chain):
-        if not chain:
-            return []
-        if isinstance(chain[0], list):
-            final_forms = []
-            for subchain in chain:
-                final_forms.extend(self.extract_final_forms(subchain))
-            return final_forms
-        return [chain[0]]  # The first element is always the current evolution
 
 
     def update_selected_count(self):
         count = len(self.selected_pokemons)
         self.selected_count_label.config(text=f"Selected: {count}")
 
+    @instrument.timed("picker.update_pokemon_icon")
     def update_pokemon_icon(self, label):
         selected_pokemon_name = self.selected_pokemon.get().lower()
-        index = next(
-            (
-                i
-                for i, pokemon in enumerate(self.pokemon_data)
-                if pokemon["name"].lower() == selected_pokemon_name
-            ),
-            None,
-        )
-
-        if index is not None:
-            image_path = f"data/images/pokemons/{index + 1}.png"
-
-            try:
-                img = Image.open(image_path)
-                img = img.resize((96, 96), resample=Image.LANCZOS)
-                img = ImageTk.PhotoImage(img)
-
-                self.pokemon_images.append(img)
-
-            except FileNotFoundError:
-                img = self.placeholder_img
 
+        if selected_pokemon_name in self.pokedex:
+            img = self.get_sprite(selected_pokemon_name)
             label.config(image=img)
             label.image = img
 
+    def get_sprite(self, pokemon_name):
+        # The decoded sprite if it is cached, else the placeholder; sprites
+        # are decoded in the background (see request_sprites) and swapped in
+        # by on_sprite_loaded
+        key = self.pokedex.sprite_key(pokemon_name)
+        img = self.sprite_cache.get(key)
+        if img is None:
+            return self.placeholder_img
+        self.sprite_cache.move_to_end(key)
+        return img
+
+    def missing_sprites(self, names):
+        # Sprites not decoded yet; keys without a file in the manifest keep
+        # the placeholder and are never requested
+        keys = (self.pokedex.sprite_key(name) for name in names)
+        return [key for key in keys if key in self.sprite_manifest and key not in self.sprite_cache]
+
+    def request_sprites(self):
+        # Rows in view first, then the rows around them and the top search
+        # results; the loader drops whatever was queued for an older view
+        grid = self.sprite_grid
+        visible = grid.visible_positions()
+        margin = PREFETCH_ROWS * grid.columns
+        below = grid.entries[visible.stop:visible.stop + margin]
+        above = grid.entries[max(0, visible.start - margin):visible.start][::-1]
+        self.sprite_loader.request(
+            self.missing_sprites(grid.entries[visible.start:visible.stop]),
+            self.missing_sprites(below + above + self.search_prefetch),
+        )
+
+    @instrument.timed("picker.on_sprite_loaded")
+    def on_sprite_loaded(self, key, img):
+        # Sprites that can't be decoded keep showing the placeholder
+        img = img or self.placeholder_img
+        self.sprite_cache[key] = img
+        if len(self.sprite_cache) > SPRITE_CACHE_SIZE:
+            self.sprite_cache.popitem(last=False)
+
+        for label in self.sprite_grid.labels():
+            if label.entry is not None and self.pokedex.sprite_key(label.entry) == key:
+                label.config(image=img)
+                label.image = img
+
+    def render_pokemon_label(self, label, pokemon_name):
+        img = self.get_sprite(pokemon_name)
+        text = pokemon_name.capitalize()
+        dex = self.project.active_dex() if self.project is not None else None
+        if not self.show_full_list and dex is not None and pokemon_name in dex.order:
+            # Regional dex number in the picked view
+            text = f"#{dex.number(pokemon_name):03} {text}"
+        label.config(image=img, text=text)
+        label.image = img  # Keep a reference to avoid garbage collection
+        self.style_pokemon_label(label, pokemon_name)
+
+    def style_pokemon_label(self, label, pokemon_name):
+        relief = "solid" if pokemon_name in self.selected_pokemons else "flat"
+        label.config(bd=3, relief=relief)
+
     def style_widgets(self):
         # Use a theme for ttk widgets that is available on your system
         style = ttk.Style()
@@ -172,6 +378,7 @@ class PokemonPicker:
         # Configure the ttk Entry style
         style.configure("TEntry", padding=6)
 
+    @instrument.timed("picker.create_widgets")
     def create_widgets(self):
         # Top frame for search and action buttons
         top_frame = tk.Frame(self.root)
@@ -179,11 +386,23 @@ class PokemonPicker:
 
         # Search bar within the top frame
         self.search_entry = ttk.Entry(top_frame, width=50)
-        self.search_entry.insert(0, "Search by name")
+        self.search_entry.insert(0, SEARCH_PLACEHOLDER)
         self.search_entry.bind("<FocusIn>", self.on_search_focus)
-        self.search_entry.bind("<KeyRelease>", self.filter_pokemon_list_view)
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
         self.search_entry.pack(side=tk.LEFT, padx=10, pady=5)
 
+        # Stat filter ("bst 400-520 fire|dragon spe>90") and grid sort order
+        self.stat_filter_entry = ttk.Entry(top_frame, width=24)
+        self.stat_filter_entry.bind("<Return>", self.filter_pokemon_list_view)
+        self.stat_filter_entry.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.sort_box = ttk.Combobox(
+            top_frame, values=list(SORT_OPTIONS), width=8, state="readonly"
+        )
+        self.sort_box.set("Dex No.")
+        self.sort_box.bind("<<ComboboxSelected>>", self.filter_pokemon_list_view)
+        self.sort_box.pack(side=tk.LEFT, padx=5, pady=5)
+
         # Action buttons within the top frame
         self.generate_button = ttk.Button(
             top_frame, text="Generate JSON", command=self.generate_json
@@ -200,11 +419,42 @@ class PokemonPicker:
         )
         self.deselect_button.pack(side=tk.LEFT, padx=5, pady=5)
 
+        self.select_filtered_button = ttk.Button(
+            top_frame, text="Select Filtered", command=self.select_filtered
+        )
+        self.select_filtered_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.invert_button = ttk.Button(
+            top_frame, text="Invert Selection", command=self.invert_selection
+        )
+        self.invert_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.balance_button = ttk.Button(
+            top_frame, text="Dex Balance", command=self.show_balance_window
+        )
+        self.balance_button.pack(side=tk.LEFT, padx=5, pady=5)
+
         self.toggle_view_button = ttk.Button(
             top_frame, text="Show Picked Only", command=self.toggle_view
         )
         self.toggle_view_button.pack(side=tk.LEFT, padx=5, pady=5)
 
+        # Saved dexes of the open project
+        self.dex_box = ttk.Combobox(top_frame, width=14, state="readonly")
+        self.dex_box.bind("<<ComboboxSelected>>", self.change_dex)
+        self.dex_box.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.new_dex_button = ttk.Button(top_frame, text="New Dex", command=self.new_dex)
+        self.new_dex_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.open_project_button = ttk.Button(
+            top_frame, text="Open...", command=self.choose_project
+        )
+        self.open_project_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.note_button = ttk.Button(top_frame, text="Note", command=self.edit_note)
+        self.note_button.pack(side=tk.LEFT, padx=5, pady=5)
+
         # Bottom frame for the Pokémon selection and details display
         bottom_frame = tk.Frame(self.root)
         bottom_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
@@ -213,33 +463,34 @@ class PokemonPicker:
         self.canvas = tk.Canvas(
             bottom_frame,
             width=120 * 10 + 20,
-            height=100 * ((len(self.pokemon_data) - 1) // 10 + 1) + 20,
+            height=130 * 5 + 20,
         )
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        scrollbar = tk.Scrollbar(bottom_frame, command=self.canvas.yview)
+        # Only the rows in view get labels, recycled as the canvas scrolls
+        self.sprite_grid = VirtualSpriteGrid(
+            self.canvas,
+            render=self.render_pokemon_label,
+            style=self.style_pokemon_label,
+            on_click=self.pick_pokemon,
+            on_hover=self.display_pokemon_info_on_hover,
+            on_refresh=self.request_sprites,
+            on_move=self.move_picked,
+        )
+
+        scrollbar = tk.Scrollbar(bottom_frame, command=self.sprite_grid.yview)
         scrollbar.pack(side=tk.LEFT, fill=tk.Y)
         self.canvas.configure(yscrollcommand=scrollbar.set)
 
-        # Frame within the canvas for Pokémon images
-        self.frame = tk.Frame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.frame, anchor="nw")
-
         # Details frame within the bottom frame
         self.details_frame = tk.Frame(bottom_frame, width=200)
         self.details_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10)
         self.details_frame.pack_propagate(False)
 
-        # Details title and text widget within the details frame
-        self.details_title = tk.Label(
-            self.details_frame, text="Pokémon Details", font=("Arial", 16)
-        )
-        self.details_title.pack(pady=(5, 10))
-
-        self.details_text = tk.Text(
-            self.details_frame, wrap=tk.WORD, font=("Arial", 12), state=tk.DISABLED
+        # Details panel, built once and updated in place on hover/click
+        self.details_panel = DetailsPanel(
+            self.details_frame, bg=self.root.cget("bg"), icon_dir=f"{self.data_dir}/images/types"
         )
-        self.details_text.pack(fill=tk.BOTH, expand=True)
 
         # Button to toggle final evolution view
         self.final_evo_button = ttk.Button(
@@ -249,131 +500,102 @@ class PokemonPicker:
         )
         self.final_evo_button.pack(side=tk.LEFT, padx=5, pady=5)
 
-        # Pokémon image placeholders and labels
-        self.pokemon_images = []
-        self.pokemon_labels = []
+        # Language of the ability descriptions
+        self.language_box = ttk.Combobox(
+            top_frame, values=self.ability_texts.languages(), width=8, state="readonly"
+        )
+        self.language_box.set(self.ability_texts.language)
+        self.language_box.bind("<<ComboboxSelected>>", self.change_language)
+        self.language_box.pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Pokémon sprites are decoded on background threads as their rows
+        # come near the view, and kept in an LRU of PhotoImages
+        images_dir = f"{self.data_dir}/images"
+        self.sprite_loader = SpriteLoader(
+            self.root, self.on_sprite_loaded,
+            sprite_dir=f"{images_dir}/pokemons",
+            atlas_image=f"{images_dir}/sprite_atlas.png",
+            atlas_index=f"{images_dir}/sprite_atlas.json",
+        )
+        self.sprite_cache = OrderedDict()
         self.placeholder_img = ImageTk.PhotoImage(
             Image.new("RGBA", (96, 96), (255, 255, 255, 0))
         )
 
-        for i, pokemon in enumerate(self.pokemon_data):
-            image_path = f"data/images/pokemons/{i + 1}.png"
-            try:
-                img = Image.open(image_path)
-                img = img.resize((96, 96), Image.LANCZOS)
-                img = ImageTk.PhotoImage(img)
-                self.pokemon_images.append(img)
-            except FileNotFoundError:
-                img = self.placeholder_img
-
-            label = tk.Label(
-                self.frame,
-                image=img,
-                text=pokemon["name"].capitalize(),
-                compound="top",
-                bd=0,
-            )
-            label.image = img  # Keep a reference to avoid garbage collection
-            label.bind(
-                "<Button-1>",
-                lambda event, name=pokemon["name"], label=label: self.pick_pokemon(
-                    name, label
-                ),
-            label.bind("<Enter>", lambda event, name=pokemon["name"]: self.display_pokemon_info_on_hover(name))
-            )
-            self.pokemon_labels.append(label)
-            label.grid(row=i // 10, column=i % 10, padx=5, pady=5)
-
         # Counter label for selected Pokémons
         self.selected_count_label = ttk.Label(top_frame, text="Selected: 0")
         self.selected_count_label.pack(side=tk.RIGHT, padx=10, pady=5)
 
-        # Update the scrollregion to encompass the inner frame
-        self.canvas.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        self.show_full_list_view()
 
     def on_search_focus(self, event):
-        if self.search_entry.get() == "Search by name":
+        if self.search_entry.get() == SEARCH_PLACEHOLDER:
             self.search_entry.delete(0, tk.END)
 
-    def deselect_all(self):
-        self.selected_pokemons = []
+    def search_query(self):
+        # The search bar's text, empty while it shows the placeholder
+        query = self.search_entry.get()
+        return "" if query == SEARCH_PLACEHOLDER else query
 
-        for label, original_image in zip(self.pokemon_labels, self.pokemon_images):
-            if label["text"].lower() not in self.selected_pokemons:
-                label.config(image=original_image, bd=3, relief="flat")
-            else:
-                self.update_pokemon_icon(label)
-            # Update the counter
-        self.update_selected_count()
+    def deselect_all(self):
+        self.selected_pokemons.clear()
 
     def update_icons(self):
-        for label in self.pokemon_labels:
+        for label in self.sprite_grid.labels():
             self.update_pokemon_icon(label)
 
-    def load_final_evolutions(self):
-        try:
-            with open("data/evolution_chains.json", "r") as file:
-                all_chains = json.load(file)
-                final_evolutions = {}
-                for chain in all_chains.values():
-                    for base_form, data in chain.items():
-                        final_evolutions[base_form] = data['final_forms']
-                return final_evolutions
-        except FileNotFoundError:
-            print("Evolution chains file not found.")
-            return {}
-        except Exception as e:
-            print(f"Error reading evolution chains file: {e}")
-            return {}
+    @instrument.timed("picker.schedule_search")
+    def schedule_search(self, event=None):
+        # Debounce keystrokes so a fast typist only triggers one filter pass
+        if self.pending_search is not None:
+            self.root.after_cancel(self.pending_search)
+        self.pending_search = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_pokemon_list_view)
 
-    def filter_pokemon_list_view(self, event=None):
-        search_query = self.search_entry.get().lower()
+        # Start decoding the top matches while the grid update is debounced
+        self.search_prefetch = self.search_index.search(self.search_query())[:SEARCH_PREFETCH]
+        self.request_sprites()
 
-        # Reset the view
-        for label in self.pokemon_labels:
-            label.grid_forget()
+    @instrument.timed("picker.filter_pokemon_list_view")
+    def filter_pokemon_list_view(self, event=None):
+        self.pending_search = None
+        self.search_prefetch = []
+        # Names matching the query, in dex order ("type:" and "ability:"
+        # prefixes search those fields instead of the name)
+        names = self.search_index.search(self.search_query())
 
         if self.show_final_evolutions_only:
-            # Filter for final evolutions and apply search query if it exists
-            final_evo_names = {name for names in self.final_evolutions.values() for name in names}
-            if search_query:
-                filtered_labels = [label for label in self.pokemon_labels if label["text"].lower() in final_evo_names and search_query in label["text"].lower()]
-            else:
-                filtered_labels = [label for label in self.pokemon_labels if label["text"].lower() in final_evo_names]
+            # Filter for final evolutions
+            filtered = [name for name in names if name in self.pokedex.final_forms]
         elif not self.show_full_list:
-            # Filter within selected Pokémon and apply search query if it exists
-            if search_query:
-                filtered_labels = [label for label in self.pokemon_labels if label["text"].lower() in self.selected_pokemons and search_query in label["text"].lower()]
-            else:
-                filtered_labels = [label for label in self.pokemon_labels if label["text"].lower() in self.selected_pokemons]
+            # Filter within selected Pokémon, in regional order
+            matches = set(names)
+            filtered = [name for name in self.project.active_dex().order if name in matches]
         else:
             # Normal search in full list
-            filtered_labels = [label for label in self.pokemon_labels if search_query in label["text"].lower()]
-
-        # Display the filtered labels
-        for i, label in enumerate(filtered_labels):
-            row, col = divmod(i, 10)
-            label.grid(row=row, column=col, padx=5, pady=5)
-
-        # Update scroll region
-        self.canvas.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+            filtered = names
 
+        filtered = self.apply_stat_filter_and_sort(filtered)
 
-    def extract_final_evolutions(self, chain):
-        # If the chain is empty or has no further evolutions, it's a final form
-        if not chain or 'evolves_to' not in chain[-1]:
-            return [chain[-1]]
+        # Display the filtered entries
+        self.sprite_grid.set_entries(filtered)
+        if not self.show_full_list:
+            self.sprite_grid.redraw()
 
-        # If there's a split, recursively extract final evolutions from each branch
-        final_forms = []
-        for next_step in chain[-1]['evolves_to']:
-            final_forms.extend(self.extract_final_evolutions(chain + [next_step]))
-
-        return final_forms
 
+    def apply_stat_filter_and_sort(self, names):
+        stat_query = self.stat_filter_entry.get().strip()
+        if stat_query:
+            try:
+                names = self.stats_table.filter(names, stat_query)
+                self.stat_filter_entry.config(foreground="")
+            except ValueError as e:
+                print(f"Invalid stat filter: {e}")
+                self.stat_filter_entry.config(foreground="red")
 
+        sort_by = SORT_OPTIONS.get(self.sort_box.get())
+        if sort_by is not None:
+            names = self.stats_table.sort(names, sort_by)
+        return names
 
     def toggle_view(self):
         self.show_full_list = not self.show_full_list
@@ -391,15 +613,15 @@ class PokemonPicker:
             self.show_picked_pokemon_view()
             self.toggle_view_button.config(text="Show All")
 
+        # The label text has regional numbers in the picked view only
+        self.sprite_grid.redraw()
+
         # Reset vertical scroll position to the top
-        self.canvas.yview_moveto(0)
+        self.sprite_grid.scroll_to_top()
 
 
     def show_full_list_view(self):
-        for i, label in enumerate(self.pokemon_labels):
-            col = i % 10
-            row = i // 10
-            label.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+        self.sprite_grid.set_entries(self.apply_stat_filter_and_sort(self.pokedex.names()))
 
     def toggle_final_evolutions(self):
         self.show_final_evolutions_only = not self.show_final_evolutions_only
@@ -416,188 +638,115 @@ class PokemonPicker:
         # Determine if we should filter by final evolutions
         filter_final_evolutions = self.show_final_evolutions_only
 
-        # Get the list of final evolution names if needed
-        final_evolution_names = {name for names in self.final_evolutions.values() for name in names} if filter_final_evolutions else set()
-
-        selected_labels = []
-        for label in self.pokemon_labels:
-            pokemon_name = label["text"].lower()
+        # Picked Pokémon in regional dex order
+        picked = []
+        for pokemon_name in self.project.active_dex().order:
             if pokemon_name in self.selected_pokemons:
                 # If we are filtering by final evolutions, check if the Pokémon is a final evolution
-                if filter_final_evolutions and pokemon_name in final_evolution_names:
-                    selected_labels.append(label)
+                if filter_final_evolutions and pokemon_name in self.pokedex.final_forms:
+                    picked.append(pokemon_name)
                 elif not filter_final_evolutions:
-                    selected_labels.append(label)
+                    picked.append(pokemon_name)
 
-        for label in self.pokemon_labels:
-            if label in selected_labels:
-                row, col = divmod(self.pokemon_labels.index(label), 10)
-                label.grid(row=row, column=col, padx=5, pady=5)
-            else:
-                label.grid_forget()
+        self.sprite_grid.set_entries(self.apply_stat_filter_and_sort(picked))
 
 
     def fetch_pokemon_details(self, pokemon_name):
-        # Search for the Pokémon in the cached data
-        for pokemon in self.pokemon_data:
-            if pokemon["name"].lower() == pokemon_name.lower():
-                types = ", ".join(pokemon.get("types", []))
-
-                # Formatting and fetching abilities with flavor texts
-                abilities_info = ""
-                for ability in pokemon.get("normal_abilities", []) + pokemon.get(
-                    "hidden_abilities", []
-                ):
-                    formatted_ability = self.format_ability_name(ability)
-                    flavor_text_en = self.ability_flavor_texts.get(ability, {}).get(
-                        "en", "No description available."
-                    )
-                    abilities_info += f"{formatted_ability}: {flavor_text_en}\n"
-
-                # Preparing stats
-                stats = pokemon.get("stats", {})
-
-                # Format the details for display
-                details = f"{pokemon_name.capitalize()}\nTypes: {types}\n{abilities_info}"
-                return details, stats
+        # Look the Pokémon up in the indexed store
+        pokemon = self.pokedex.get(pokemon_name)
+        if pokemon is not None:
+            types = ", ".join(pokemon.get("types", []))
+            # Sprite-only forms have no data of their own, only their species
+            form_of = f"Form of {pokemon['species'].capitalize()}\n" if "species" in pokemon else ""
+
+            # Formatting and fetching abilities with flavor texts
+            abilities_info = ""
+            for ability in pokemon.get("normal_abilities", []) + pokemon.get(
+                "hidden_abilities", []
+            ):
+                formatted_ability = self.format_ability_name(ability)
+                flavor_text = self.ability_texts.get(ability) or "No description available."
+                abilities_info += f"{formatted_ability}: {flavor_text}\n"
+
+            # Preparing stats
+            stats = pokemon.get("stats", {})
+
+            # Format the details for display
+            details = (
+                f"{pokemon_name.capitalize()}\nTypes: {types}\n{form_of}{self.format_matchups(pokemon_name)}"
+                f"{self.format_evolution(pokemon['name'])}\n{abilities_info}"
+            )
+            note = self.project.active_dex().notes.get(pokemon_name) if self.project else None
+            if note:
+                details += f"Note: {note}\n"
+            return details, stats
 
         return "Details not found.", {}
 
-    def get_stat_color(self, stat):
-        # Return a color based on the stat name
-        colors = {
-            "hp": "green",
-            "attack": "red",
-            "defense": "orange",
-            "special-attack": "pink",
-            "special-defense": "blue",
-            "speed": "cyan",
-        }
-        return colors.get(stat.lower(), "grey")
-
-    def load_ability_flavor_texts(self):
-        try:
-            with open("data/abilities_flavor_text.json", "r") as file:
-                return json.load(file)
-        except FileNotFoundError:
-            print("Ability flavor text file not found.")
-            return {}
-        except Exception as e:
-            print(f"Error reading ability flavor text file: {e}")
-            return {}
+    def format_matchups(self, pokemon_name):
+        # "Weak to: rock (4x), water\nImmune to: ground\n", empty without types
+        defense = self.type_matchups.defense(pokemon_name)
+        weak = [t if m == 2 else f"{t} ({m:g}x)" for t, m in sorted(defense.items(), key=lambda i: -i[1]) if m > 1]
+        immune = [t for t, m in defense.items() if m == 0]
+        text = f"Weak to: {', '.join(weak)}\n" if weak else ""
+        if immune:
+            text += f"Immune to: {', '.join(immune)}\n"
+        return text
+
+    def format_evolution(self, pokemon_name):
+        # "Stage 2, evolves from Charmander into Charizard"
+        evolution = self.pokedex.evolution
+        info = f"Stage {evolution.stage(pokemon_name)}"
+        parent = evolution.evolves_from(pokemon_name)
+        if parent:
+            info += f", evolves from {parent.capitalize()}"
+        children = evolution.evolves_into(pokemon_name)
+        if children:
+            info += " into " if parent else ", evolves into "
+            info += " / ".join(child.capitalize() for child in children)
+        return info
 
     def format_ability_name(self, ability_name):
         return ability_name.replace("-", " ").capitalize()
 
+    @instrument.timed("picker.display_pokemon_details")
     def display_pokemon_details(self, details, stats):
-        # Clear the frame of previous details and bars
-        for widget in self.details_frame.winfo_children():
-            widget.destroy()
-
-        # Set up font styles
-        title_font = ("Arial", 14, "bold")
-        content_font = ("Arial", 10)
-
-        # Display the text details (name, types, etc.)
-        details_text = tk.Text(self.details_frame, wrap=tk.WORD, bg=self.root.cget('bg'))
-        details_text.pack(side=tk.TOP, fill=tk.BOTH, padx=5, pady=5)
-
-        # Insert Pokémon name
-        details_text.tag_configure("name", font=title_font)
-        details_text.insert(tk.END, details.split('\n')[0] + '\n', "name")
-
-        # Display the type icons
-        types_frame = tk.Frame(self.details_frame)
-        types_frame.pack(pady=5)
-
-        pokemon_types = details.split('\n')[1].replace("Types: ", "").split(", ")
-        for type_name in pokemon_types:
-            type_img_path = f"data/images/types/{type_name.capitalize()}.png"
-            try:
-                type_img = Image.open(type_img_path)
-                type_img = type_img.resize((80, 20), Image.LANCZOS)  # Adjust the size as needed
-                type_photo = ImageTk.PhotoImage(type_img)
-                type_label = tk.Label(types_frame, image=type_photo)
-                type_label.image = type_photo  # Keep a reference
-                type_label.pack(side=tk.LEFT, padx=2)
-            except FileNotFoundError:
-                print(f"Type icon not found: {type_img_path}")
-
-        # Re-enable text widget, insert abilities info, and disable it again
-        details_text.config(state=tk.NORMAL)
-        abilities_info = details.split('\n')[2:]
-        for info in abilities_info:
-            details_text.insert(tk.END, info + '\n', "content")
-        details_text.config(state=tk.DISABLED)  # Make the text widget read-only
-
-        # Display the stat bars
-        self.display_stat_bars(stats)
-
-
-
+        self.details_pokemon = details.split("\n")[0].lower()
+        self.details_panel.show(details, stats)
 
+    def change_language(self, event=None):
+        # Only the newly picked language's texts get loaded
+        self.ability_texts.set_language(self.language_box.get())
+        if self.details_pokemon in self.pokedex:
+            self.display_pokemon_details(*self.fetch_pokemon_details(self.details_pokemon))
 
     def display_pokemon_info_on_hover(self, pokemon_name):
+        # Sweeping the mouse across the grid fires many <Enter> events; only
+        # the latest hovered Pokémon gets rendered once the loop is idle
+        scheduled = self.pending_hover is not None
+        self.pending_hover = pokemon_name
+        if not scheduled:
+            self.root.after_idle(self.render_pending_hover)
+
+    @instrument.timed("picker.render_pending_hover")
+    def render_pending_hover(self):
+        pokemon_name, self.pending_hover = self.pending_hover, None
+        if pokemon_name is None:
+            return
         details, stats = self.fetch_pokemon_details(pokemon_name)
         #print(f"Details fetched for {pokemon_name}: {details}")  # Debug print for verification
         self.display_pokemon_details(details, stats)
 
-    def display_stat_bars(self, stats):
-        # Clear out any existing widgets in the details_frame
-        for widget in self.details_frame.winfo_children():
-            if isinstance(widget, tk.Canvas) or isinstance(widget, tk.Label):
-                widget.destroy()
-
-        # Define abbreviations for stat names
-        stat_abbreviations = {
-            "hp": "HP",
-            "attack": "ATK",
-            "defense": "DEF",
-            "special-attack": "SpATK",
-            "special-defense": "SpDEF",
-            "speed": "SPE",
-        }
-
-        # Calculate the total of all stats (BST)
-        bst = sum(stats.values())
-
-        # Define a maximum value for stats to normalize the bar length
-        max_stat_value = 150
-
-        for stat, value in stats.items():
-            # Create a frame for each stat
-            stat_frame = tk.Frame(self.details_frame)
-            stat_frame.pack(fill=tk.X, padx=5, pady=2)
-
-            # Use abbreviation for the stat name
-            abbrev = stat_abbreviations.get(stat, stat).capitalize()
-
-            # Create a label with the stat abbreviation
-            tk.Label(stat_frame, text=abbrev, width=6, anchor="w").pack(side=tk.LEFT)
-
-            # Create a label for the stat value
-            value_label = tk.Label(stat_frame, text=f"{value}", width=4, anchor="e")
-            value_label.pack(side=tk.RIGHT)
-
-            # Create a canvas for the bar
-            canvas = tk.Canvas(stat_frame, height=10, bg="white")
-            canvas.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            canvas.update_idletasks()  # Refresh the UI to get updated dimensions
-
-            # Draw the bar on the canvas
-            bar_length = (value / max_stat_value) * canvas.winfo_width()
-            canvas.create_rectangle(
-                0, 0, bar_length, 10, fill=self.get_stat_color(stat), outline=""
-            )
-
-        # Display the Base Stat Total
-        bst_frame = tk.Frame(self.details_frame)
-        bst_frame.pack(fill=tk.X, padx=5, pady=5)
-        tk.Label(bst_frame, text="Total", width=6, anchor="w").pack(side=tk.LEFT)
-        tk.Label(bst_frame, text=f"{bst}", anchor="e").pack(side=tk.RIGHT)
-
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regional Pokédex Maker")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--project", default=DEFAULT_PROJECT, help="dex project to open (created if missing)")
+    parser.add_argument("--metrics", help="write timing histograms and counters to this JSON file on exit")
+    parser.add_argument("--profile", help="write a cProfile of the session to this file on exit")
+    args = parser.parse_args()
+    instrument.enable(args.metrics, args.profile)
+
     root = tk.Tk()
-    app = PokemonPicker(root)
+    app = PokemonPicker(root, data_dir=args.data_dir, project_path=args.project)
     root.mainloop()
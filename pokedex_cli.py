@@ -0,0 +1,171 @@
+import argparse
+import os
+import sys
+import time
+
+from pokedex_core import (
+    PokedexStore,
+    SelectionAnalytics,
+    build_dataset,
+    build_dex,
+    export_dexes,
+    instrument,
+    load_definitions,
+    render_export,
+)
+from pokedex_core.export import FORMATS
+from pokedex_core.project import JOURNAL_SUFFIX, Project
+from pokedex_core.store import STAT_ALIASES, STAT_NAMES
+
+# Short and full stat names accepted by --sort
+SORT_CHOICES = list(dict.fromkeys([*STAT_ALIASES, *STAT_NAMES]))
+
+# Headless front end for building regional dexes from scripts and CI. Only
+# the core package is imported, never tkinter or PIL:
+#
+#   python pokedex_cli.py dex --search type:dragon --final -o dragons.json
+#   python pokedex_cli.py dex --stats "bst>=500 spe>90" --sort spe --format txt
+#   python pokedex_cli.py batch regions.json --formats json,csv,md -d exports
+#   python pokedex_cli.py compile
+#   python pokedex_cli.py project projects/default.pdex --dex Kanto --format md
+
+
+def write_output(text, path):
+    if path == "-":
+        sys.stdout.write(text + "\n")
+        return True
+    try:
+        with open(path, "w") as file:
+            file.write(text)
+        return True
+    except Exception as e:
+        print(f"Error saving {path}: {e}", file=sys.stderr)
+        return False
+
+
+def run_dex(args):
+    pokedex = PokedexStore.load(args.data_dir)
+    try:
+        dex = build_dex(
+            pokedex,
+            search=args.search,
+            stat_filter=args.stats,
+            final_evolutions_only=args.final,
+            include_chains=args.chains,
+            sort_by=args.sort,
+        )
+    except ValueError as e:
+        print(f"Invalid stat filter: {e}", file=sys.stderr)
+        return 2
+
+    text = render_export(args.format, pokedex, dex)
+    if not write_output(text, args.output):
+        return 1
+
+    if args.report:
+        from pokedex_core.matchups import TypeMatchups
+        print(SelectionAnalytics(pokedex, dex).report(), file=sys.stderr)
+        print(file=sys.stderr)
+        print(TypeMatchups(pokedex).coverage(dex).report(), file=sys.stderr)
+    return 0
+
+
+def run_batch(args):
+    try:
+        definitions = load_definitions(args.definitions)
+        formats = [export_format.strip() for export_format in args.formats.split(",") if export_format.strip()]
+        results = export_dexes(definitions, args.output_dir, formats, args.data_dir, args.workers)
+
+        failed = 0
+        start = time.perf_counter()
+        for name, count, paths, error in results:
+            if error:
+                failed += 1
+                print(f"Error exporting {name}: {error}", file=sys.stderr)
+            elif args.verbose:
+                print(f"{name}: {count} Pokémon -> {', '.join(paths)}")
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    done = len(definitions) - failed
+    rate = done / elapsed if elapsed else float("inf")
+    print(f"Exported {done}/{len(definitions)} dexes to {args.output_dir} in {elapsed:.2f}s ({rate:.0f} dexes/s)")
+    return 1 if failed else 0
+
+
+def run_project(args):
+    # Read only: the journal is replayed but neither file is rewritten
+    if not os.path.exists(args.project) and not os.path.exists(args.project + JOURNAL_SUFFIX):
+        print(f"Project not found: {args.project}", file=sys.stderr)
+        return 2
+    try:
+        project = Project(args.project, read_only=True)
+    except (OSError, ValueError) as e:
+        print(f"Error opening project {args.project}: {e}", file=sys.stderr)
+        return 2
+
+    if args.dex is None:
+        for name, dex in project.dexes.items():
+            active = "*" if name == project.active else " "
+            print(f"{active} {name}: {len(dex.entries)} Pokémon, {len(dex.notes)} notes")
+        return 0
+    if args.dex not in project.dexes:
+        print(f"No dex named {args.dex!r} in {args.project}", file=sys.stderr)
+        return 2
+    pokedex = PokedexStore.load(args.data_dir)
+    text = render_export(args.format, pokedex, project.dexes[args.dex].order)
+    return 0 if write_output(text, args.output) else 1
+
+
+def run_compile(args):
+    build_dataset(args.data_dir)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and export regional Pokédexes without the GUI")
+    parser.add_argument("--data-dir", default="data", help="directory holding the fetched data files")
+    parser.add_argument("--metrics", help="write timing histograms and counters to this JSON file on exit")
+    parser.add_argument("--profile", help="write a cProfile of the run to this file on exit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dex_parser = commands.add_parser("dex", help="filter the Pokédex and export the result")
+    dex_parser.add_argument("--search", default="", help='search query, e.g. "char", "type:fire", "ability:levitate"')
+    dex_parser.add_argument("--stats", default="", help='stat filter, e.g. "bst 400-520 fire|dragon spe>90"')
+    dex_parser.add_argument("--final", action="store_true", help="keep final evolutions only")
+    dex_parser.add_argument("--chains", action="store_true", help="add the whole evolution chain of every match")
+    dex_parser.add_argument("--sort", default=None, choices=SORT_CHOICES, metavar="STAT",
+                            help=f"sort by a stat ({', '.join(STAT_ALIASES)} or the full stat name)")
+    dex_parser.add_argument("--format", choices=sorted(FORMATS), default="json")
+    dex_parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    dex_parser.add_argument("--report", action="store_true", help="print a balance report to stderr")
+    dex_parser.set_defaults(func=run_dex)
+
+    batch_parser = commands.add_parser("batch", help="export many dex definitions in parallel")
+    batch_parser.add_argument("definitions", help="JSON file with a list of dex definitions")
+    batch_parser.add_argument("-d", "--output-dir", default="exports")
+    batch_parser.add_argument("--formats", default="json", help=f"comma separated, any of {', '.join(sorted(FORMATS))}")
+    batch_parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                              help="worker processes, 0 exports in this process")
+    batch_parser.add_argument("-v", "--verbose", action="store_true", help="print every exported dex")
+    batch_parser.set_defaults(func=run_batch)
+
+    project_parser = commands.add_parser("project", help="list or export the dexes of a saved project")
+    project_parser.add_argument("project", help="project file (.pdex)")
+    project_parser.add_argument("--dex", help="dex to export, lists the dexes when omitted")
+    project_parser.add_argument("--format", choices=sorted(FORMATS), default="json")
+    project_parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    project_parser.set_defaults(func=run_project)
+
+    compile_parser = commands.add_parser("compile", help="compile the JSON data files into pokedex.bin")
+    compile_parser.set_defaults(func=run_compile)
+
+    args = parser.parse_args(argv)
+    instrument.enable(args.metrics, args.profile)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
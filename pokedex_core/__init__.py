@@ -0,0 +1,26 @@
+# Headless core of the Regional Pokédex Maker: loading, searching, filtering,
+# evolution handling and export, usable from scripts without tkinter or PIL.
+# The NumPy engines live in pokedex_core.stats (stat filters and sorting)
+# and pokedex_core.matchups (type matchups and coverage), and are only
+# imported by the code paths that use them.
+from .ability_texts import AbilityTextStore
+from . import instrument
+from .analytics import SelectionAnalytics
+from .batch import export_dexes, load_definitions
+from .dataset import build_dataset, open_dataset
+from .dex import build_dex
+from .evolution import EvolutionGraph
+from .export import (
+    export_dex,
+    render_export,
+    render_json_export,
+    render_plain_list,
+    write_json_export,
+    write_plain_list,
+)
+from .order import RegionalOrder
+from .project import Project
+from .search import SearchIndex
+from .selection import Selection
+from .sprites import SpriteManifest, load_sprite_manifest
+from .store import PokedexStore
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+import json
+import os
+
+from .json_io import load_json_file, write_json_atomic
+
+FLAVOR_TEXT_FILE = "abilities_flavor_text.json"
+# One {ability: text} file per language, plus an index of the languages
+SHARD_DIR = "abilities"
+SHARD_INDEX = "index.json"
+
+# Languages kept in memory at once
+SHARD_CACHE_SIZE = 3
+DEFAULT_LANGUAGE = "en"
+
+
+def write_ability_shards(ability_flavor_texts, data_dir="data"):
+    # Split {ability: {language: text}} into one file per language
+    shards = {}
+    for ability, texts in ability_flavor_texts.items():
+        for language, text in texts.items():
+            shards.setdefault(language, {})[ability] = text
+
+    shard_dir = os.path.join(data_dir, SHARD_DIR)
+    for language, texts in shards.items():
+        write_json_atomic(os.path.join(shard_dir, f"{language}.json"), texts)
+    write_json_atomic(os.path.join(shard_dir, SHARD_INDEX), {"languages": sorted(shards)})
+    return sorted(shards)
+
+
+class AbilityTextStore:
+    # Ability flavor texts for the UI language only. Texts come from the
+    # compiled dataset when there is one (decoded one ability at a time),
+    # otherwise from per-language shards loaded on first use and kept in a
+    # small LRU, so switching language only loads that language's shard.
+    def __init__(self, data_dir="data", language=DEFAULT_LANGUAGE, dataset=None):
+        self.data_dir = data_dir
+        self.language = language
+        self.dataset = dataset
+        self.shards = OrderedDict()
+        self.texts = {}  # (ability, language) -> text, for the dataset backend
+
+        if dataset is None and self.shards_are_stale():
+            self.rebuild_shards()
+
+    def shard_path(self, name):
+        return os.path.join(self.data_dir, SHARD_DIR, name)
+
+    def shards_are_stale(self):
+        source = os.path.join(self.data_dir, FLAVOR_TEXT_FILE)
+        index = self.shard_path(SHARD_INDEX)
+        if not os.path.exists(source):
+            return False
+        return not os.path.exists(index) or os.path.getmtime(index) < os.path.getmtime(source)
+
+    def rebuild_shards(self):
+        try:
+            with open(os.path.join(self.data_dir, FLAVOR_TEXT_FILE), "r") as file:
+                write_ability_shards(json.load(file), self.data_dir)
+        except Exception as e:
+            print(f"Error splitting ability flavor texts: {e}")
+
+    def languages(self):
+        if self.dataset is not None:
+            return self.dataset.languages()
+        index = load_json_file(self.shard_path(SHARD_INDEX), {})
+        return index.get("languages", [DEFAULT_LANGUAGE])
+
+    def set_language(self, language):
+        self.language = language
+
+    def shard(self, language):
+        shard = self.shards.get(language)
+        if shard is None:
+            shard = load_json_file(self.shard_path(f"{language}.json"), {})
+            self.shards[language] = shard
+            if len(self.shards) > SHARD_CACHE_SIZE:
+                self.shards.popitem(last=False)
+        else:
+            self.shards.move_to_end(language)
+        return shard
+
+    def get(self, ability, language=None):
+        language = language or self.language
+        if self.dataset is None:
+            return self.shard(language).get(ability)
+
+        key = (ability, language)
+        if key not in self.texts:
+            self.texts[key] = self.dataset.ability_text(ability, language)
+        return self.texts[key]
@@ -0,0 +1,129 @@
+from bisect import bisect_left, insort
+from collections import Counter
+import math
+
+from .store import STAT_NAMES, TYPE_NAMES
+
+# Key used for the aggregates over the whole selection
+ALL_TYPES = "all"
+
+
+class SelectionAnalytics:
+    # Balance numbers for a regional dex, kept up to date from the
+    # selection's (added, removed) deltas: each change costs work
+    # proportional to the number of Pokémon that changed, not to the size of
+    # the selection.
+    def __init__(self, pokedex, selection=None):
+        self.pokedex = pokedex
+        self.count = 0
+        self.type_counts = Counter()
+        self.stage_counts = Counter()
+        # group ("all" or a type) -> stat -> running sum / sorted values
+        self.stat_sums = {}
+        self.stat_values = {}
+        self.listeners = []
+
+        if selection is not None:
+            self.on_selection_changed(list(selection), [])
+            selection.subscribe(self.on_selection_changed)
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def on_selection_changed(self, added, removed):
+        for name in added:
+            self.apply(name, 1)
+        for name in removed:
+            self.apply(name, -1)
+        for listener in self.listeners:
+            listener(self)
+
+    def apply(self, name, sign):
+        # Sprite-only forms have no types or stats to count
+        pokemon = self.pokedex.get(name)
+        if pokemon is None or not self.pokedex.has_data(name):
+            return
+
+        self.count += sign
+        self.stage_counts[self.pokedex.stage(name)] += sign
+        groups = [ALL_TYPES]
+        for type_name in pokemon.get("types", []):
+            self.type_counts[type_name] += sign
+            groups.append(type_name)
+
+        stats = pokemon.get("stats", {})
+        values = {stat: stats.get(stat, 0) for stat in STAT_NAMES}
+        values["bst"] = sum(values.values())
+        for group in groups:
+            sums = self.stat_sums.setdefault(group, Counter())
+            sorted_values = self.stat_values.setdefault(group, {})
+            for stat, value in values.items():
+                sums[stat] += sign * value
+                column = sorted_values.setdefault(stat, [])
+                if sign > 0:
+                    insort(column, value)
+                else:
+                    del column[bisect_left(column, value)]
+
+    def group_size(self, group):
+        return self.count if group == ALL_TYPES else self.type_counts[group]
+
+    def average(self, stat, group=ALL_TYPES):
+        size = self.group_size(group)
+        return self.stat_sums.get(group, {}).get(stat, 0) / size if size > 0 else None
+
+    def percentile(self, stat, percent, group=ALL_TYPES):
+        # Nearest-rank percentile, percent in 0..100
+        column = self.stat_values.get(group, {}).get(stat, [])
+        if not column:
+            return None
+        rank = max(0, min(len(column) - 1, math.ceil(percent / 100 * len(column)) - 1))
+        return column[rank]
+
+    def type_distribution(self):
+        return {type_name: self.type_counts[type_name] for type_name in TYPE_NAMES}
+
+    def coverage_gaps(self):
+        # Types no selected Pokémon has
+        return [type_name for type_name in TYPE_NAMES if self.type_counts[type_name] <= 0]
+
+    def summary(self):
+        groups = [ALL_TYPES] + [t for t in TYPE_NAMES if self.type_counts[t] > 0]
+        return {
+            "count": self.count,
+            "types": self.type_distribution(),
+            "coverage_gaps": self.coverage_gaps(),
+            "stages": {stage: count for stage, count in sorted(self.stage_counts.items()) if count},
+            "stats": {
+                group: {
+                    stat: {
+                        "mean": self.average(stat, group),
+                        "median": self.percentile(stat, 50, group),
+                        "p90": self.percentile(stat, 90, group),
+                    }
+                    for stat in list(STAT_NAMES) + ["bst"]
+                }
+                for group in groups
+            },
+        }
+
+    def report(self):
+        # Short plain-text version of the summary for the GUI
+        lines = [f"Selected: {self.count}"]
+        if not self.count:
+            return "\n".join(lines)
+
+        stages = ", ".join(f"stage {stage}: {count}" for stage, count in sorted(self.stage_counts.items()) if count)
+        lines.append(f"Stages: {stages}")
+        lines.append(f"Missing types: {', '.join(self.coverage_gaps()) or 'none'}")
+        lines.append("")
+        lines.append(f"{'Type':<10}{'#':>4}{'avg BST':>9}{'med':>6}{'SPE':>6}")
+        for group in [ALL_TYPES] + sorted(TYPE_NAMES, key=lambda t: -self.type_counts[t]):
+            size = self.group_size(group)
+            if size <= 0:
+                continue
+            lines.append(
+                f"{group:<10}{size:>4}{self.average('bst', group):>9.0f}"
+                f"{self.percentile('bst', 50, group):>6}{self.average('speed', group):>6.0f}"
+            )
+        return "\n".join(lines)
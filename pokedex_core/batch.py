@@ -0,0 +1,117 @@
+import concurrent.futures
+import os
+
+from .dex import build_dex
+from .export import FORMATS, export_dex
+from .json_io import load_json_file
+from .search import SearchIndex
+from .store import PokedexStore
+
+# A dex definition is a dict of build_dex options plus a name, which is
+# also the output file stem:
+#
+#   {"name": "dragons", "search": "type:dragon", "final_evolutions_only": true}
+#   {"name": "fast", "stat_filter": "spe>100", "sort_by": "spe"}
+DEX_OPTIONS = ("search", "stat_filter", "final_evolutions_only", "include_chains", "sort_by")
+
+# Dexes handed to a worker per round trip, so tiny dexes don't pay one
+# pickle/IPC exchange each
+CHUNK_SIZE = 16
+
+# Per-process state: the store and indexes are loaded once by each worker
+# and reused for every dex it renders
+worker_state = {}
+
+
+def check_dex_name(name):
+    # The name becomes a file name in the output directory, so it can't
+    # name a path of its own
+    if "/" in name or "\\" in name or ".." in name or os.path.isabs(name):
+        raise ValueError(f"Dex names can't contain path separators or '..', got {name!r}")
+
+
+def load_definitions(path):
+    # A JSON list of definitions, or {"dexes": [...]}
+    definitions = load_json_file(path)
+    if isinstance(definitions, dict):
+        definitions = definitions.get("dexes")
+    if not isinstance(definitions, list):
+        raise ValueError(f"{path} does not hold a list of dex definitions")
+
+    names = set()
+    for definition in definitions:
+        name = definition.get("name")
+        if not isinstance(name, str) or not name or name in names:
+            raise ValueError(f"Every dex needs a unique name, got {name!r}")
+        check_dex_name(name)
+        names.add(name)
+        unknown = set(definition) - set(DEX_OPTIONS) - {"name", "formats"}
+        if unknown:
+            raise ValueError(f"Unknown options for dex {name!r}: {', '.join(sorted(unknown))}")
+    return definitions
+
+
+def init_worker(data_dir):
+    pokedex = PokedexStore.load(data_dir)
+    worker_state["pokedex"] = pokedex
+    worker_state["search_index"] = SearchIndex(pokedex)
+    worker_state["stats_table"] = None
+
+
+def stats_table():
+    # Only built (and NumPy only imported) once a dex filters or sorts on stats
+    if worker_state["stats_table"] is None:
+        from .stats import StatsTable
+        worker_state["stats_table"] = StatsTable(worker_state["pokedex"])
+    return worker_state["stats_table"]
+
+
+def render_dex(definition, output_dir, formats):
+    # Build one dex and stream it to every requested format. Returns
+    # (name, number of Pokémon, written paths, error message or None).
+    pokedex = worker_state["pokedex"]
+    name = definition["name"]
+    options = {option: definition[option] for option in DEX_OPTIONS if option in definition}
+    try:
+        check_dex_name(name)
+        dex = build_dex(
+            pokedex,
+            search_index=worker_state["search_index"],
+            stats_table=stats_table() if options.get("stat_filter") or options.get("sort_by") else None,
+            **options
+        )
+        paths = []
+        for export_format in definition.get("formats", formats):
+            extension = FORMATS[export_format][0]
+            paths.append(export_dex(os.path.join(output_dir, name + extension), export_format, pokedex, dex))
+        return name, len(dex), paths, None
+    except Exception as e:
+        return name, 0, [], f"{type(e).__name__}: {e}"
+
+
+def render_chunk(definitions, output_dir, formats):
+    return [render_dex(definition, output_dir, formats) for definition in definitions]
+
+
+def export_dexes(definitions, output_dir, formats=("json",), data_dir="data", workers=None):
+    # Render every definition to output_dir, yielding render_dex results as
+    # chunks complete. workers=0 renders in this process, which is faster
+    # than a pool for a handful of dexes.
+    for export_format in formats:
+        if export_format not in FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = [definitions[i:i + CHUNK_SIZE] for i in range(0, len(definitions), CHUNK_SIZE)]
+
+    if workers == 0:
+        init_worker(data_dir)
+        for chunk in chunks:
+            yield from render_chunk(chunk, output_dir, formats)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(data_dir,)
+    ) as executor:
+        futures = [executor.submit(render_chunk, chunk, output_dir, formats) for chunk in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,312 @@
+from array import array
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+
+# Compiled form of the three JSON files written by the fetch scripts:
+#
+#   header      magic, version, section count
+#   directory   (offset, length, count) for every section below
+#   strings     every distinct string stored once (names, types, abilities,
+#               language codes, flavor texts) plus a table of offsets
+#   pokemon     fixed-width records: ids, interned names/types, six stats
+#               and a slice of the ability reference array
+#   abilities   sorted by name so a lookup is a binary search, each record
+#               pointing at its (language, text) pairs
+#   chains      evolution chains (members, final forms and parent -> child
+#               edges) as slices of a member array
+#
+# The loader memory-maps the file and only decodes what is asked for, so
+# flavor texts of abilities nobody looks at are never turned into str.
+
+DATASET_FILE = "pokedex.bin"
+SOURCE_FILES = ("pokemon_data_sorted.json", "evolution_chains.json", "abilities_flavor_text.json")
+
+MAGIC = b"PDEX"
+VERSION = 2
+NONE = 0xFFFFFFFF
+
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<III")
+OFFSET = struct.Struct("<I")
+# id, name, form, type1, type2, six stats, first ability ref, normal count, hidden count
+POKEMON = struct.Struct("<IIIII6HIHH")
+# name, first flavor, flavor count
+ABILITY = struct.Struct("<III")
+# language, text
+FLAVOR = struct.Struct("<II")
+# chain id, first member, member count, first final form, final form count,
+# first edge, edge count (edges are parent, child pairs in chain_members)
+CHAIN = struct.Struct("<IIIIIII")
+
+SECTIONS = (
+    "string_offsets", "strings", "pokemon", "ability_refs",
+    "abilities", "flavors", "chains", "chain_members",
+)
+
+
+class StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, value):
+        if value is None:
+            return NONE
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+def compile_dataset(pokemon_data, evolution_chains, ability_flavor_texts):
+    strings = StringTable()
+
+    # Abilities sorted by name; any ability a Pokémon has but that is missing
+    # from the flavor text file still gets an (empty) entry
+    ability_names = set(ability_flavor_texts)
+    for pokemon in pokemon_data:
+        ability_names.update(pokemon.get("normal_abilities", []))
+        ability_names.update(pokemon.get("hidden_abilities", []))
+    ability_names = sorted(ability_names)
+    ability_index = {name: i for i, name in enumerate(ability_names)}
+
+    abilities, flavors = [], []
+    for name in ability_names:
+        texts = ability_flavor_texts.get(name, {})
+        abilities.append(ABILITY.pack(strings.intern(name), len(flavors), len(texts)))
+        for language, text in texts.items():
+            flavors.append(FLAVOR.pack(strings.intern(language), strings.intern(text)))
+
+    records, ability_refs = [], []
+    for position, pokemon in enumerate(pokemon_data):
+        types = pokemon.get("types", []) + [None, None]
+        normal = pokemon.get("normal_abilities", [])
+        hidden = pokemon.get("hidden_abilities", [])
+        stats = pokemon.get("stats", {})
+        records.append(POKEMON.pack(
+            pokemon.get("id", position + 1),
+            strings.intern(pokemon["name"]),
+            strings.intern(pokemon.get("form", "")),
+            strings.intern(types[0]),
+            strings.intern(types[1]),
+            *(stats.get(stat, 0) for stat in STAT_NAMES),
+            len(ability_refs),
+            len(normal),
+            len(hidden),
+        ))
+        ability_refs.extend(OFFSET.pack(ability_index[name]) for name in normal + hidden)
+
+    chains, chain_members = [], []
+    for chain_id, chain in evolution_chains.items():
+        for details in chain.values():
+            members_start = len(chain_members)
+            chain_members.extend(OFFSET.pack(strings.intern(name)) for name in details["full_chain"])
+            finals_start = len(chain_members)
+            chain_members.extend(OFFSET.pack(strings.intern(name)) for name in details["final_forms"])
+            edges_start = len(chain_members)
+            edges = details.get("edges", [])
+            chain_members.extend(OFFSET.pack(strings.intern(name)) for edge in edges for name in edge)
+            chains.append(CHAIN.pack(
+                strings.intern(str(chain_id)),
+                members_start, len(details["full_chain"]),
+                finals_start, len(details["final_forms"]),
+                edges_start, len(edges),
+            ))
+
+    encoded = [value.encode("utf-8") for value in strings.strings]
+    string_offsets, position = [], 0
+    for value in encoded:
+        string_offsets.append(OFFSET.pack(position))
+        position += len(value)
+    string_offsets.append(OFFSET.pack(position))
+
+    sections = [
+        (b"".join(string_offsets), len(encoded)),
+        (b"".join(encoded), len(encoded)),
+        (b"".join(records), len(records)),
+        (b"".join(ability_refs), len(ability_refs)),
+        (b"".join(abilities), len(abilities)),
+        (b"".join(flavors), len(flavors)),
+        (b"".join(chains), len(chains)),
+        (b"".join(chain_members), len(chain_members)),
+    ]
+
+    directory, body = [], []
+    offset = HEADER.size + SECTION.size * len(sections)
+    for data, count in sections:
+        directory.append(SECTION.pack(offset, len(data), count))
+        body.append(data)
+        offset += len(data)
+    return HEADER.pack(MAGIC, VERSION, len(sections)) + b"".join(directory) + b"".join(body)
+
+
+def build_dataset(data_dir="data"):
+    sources = []
+    for filename in SOURCE_FILES:
+        with open(os.path.join(data_dir, filename), "r") as file:
+            sources.append(json.load(file))
+
+    output = os.path.join(data_dir, DATASET_FILE)
+    tmp_output = output + ".tmp"
+    with open(tmp_output, "wb") as file:
+        file.write(compile_dataset(*sources))
+    os.replace(tmp_output, output)
+    print(f"Compiled dataset saved to {output}")
+    return output
+
+
+class CompiledDataset:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, section_count = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION or section_count != len(SECTIONS):
+            raise ValueError(f"{path} is not a version {VERSION} compiled dataset")
+
+        self.sections = {}
+        for i, name in enumerate(SECTIONS):
+            self.sections[name] = SECTION.unpack_from(self.buffer, HEADER.size + i * SECTION.size)
+        self.string_cache = {}
+        self.string_offsets = self.ref_array("string_offsets")
+
+    def ref_array(self, section):
+        # A whole u32 section as an array, for sections read in bulk
+        refs = array("I")
+        refs.frombytes(self.section_bytes(section))
+        if sys.byteorder != "little":
+            refs.byteswap()
+        return refs
+
+    def section_bytes(self, section):
+        offset, length, _ = self.sections[section]
+        return self.buffer[offset:offset + length]
+
+    def close(self):
+        self.buffer.close()
+
+    def count(self, section):
+        return self.sections[section][2]
+
+    def unpack(self, record, section, index):
+        return record.unpack_from(self.buffer, self.sections[section][0] + index * record.size)
+
+    def ref(self, section, index):
+        return self.unpack(OFFSET, section, index)[0]
+
+    def string(self, string_id):
+        if string_id == NONE:
+            return None
+        value = self.string_cache.get(string_id)
+        if value is None:
+            start, end = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+            base = self.sections["strings"][0]
+            value = self.string_cache[string_id] = self.buffer[base + start:base + end].decode("utf-8")
+        return value
+
+    def pokemon_records(self):
+        # Records in the same shape as pokemon_data_sorted.json
+        records = []
+        ability_refs = self.ref_array("ability_refs")
+        ability_names = {}
+        for dex_id, name, form, type1, type2, *rest in POKEMON.iter_unpack(self.section_bytes("pokemon")):
+            stats, (ability_start, normal_count, hidden_count) = rest[:6], rest[6:]
+            abilities = []
+            for ref in ability_refs[ability_start:ability_start + normal_count + hidden_count]:
+                if ref not in ability_names:
+                    ability_names[ref] = self.ability_name(ref)
+                abilities.append(ability_names[ref])
+            records.append({
+                "id": dex_id,
+                "name": self.string(name),
+                "form": self.string(form),
+                "types": [self.string(t) for t in (type1, type2) if t != NONE],
+                "normal_abilities": abilities[:normal_count],
+                "hidden_abilities": abilities[normal_count:],
+                "stats": dict(zip(STAT_NAMES, stats)),
+            })
+        return records
+
+    def evolution_chains(self):
+        # Chains in the same shape as evolution_chains.json
+        chains = {}
+        members = [self.string(ref) for ref in self.ref_array("chain_members")]
+        for chain_id, members_start, members_count, finals_start, finals_count, edges_start, edges_count in CHAIN.iter_unpack(self.section_bytes("chains")):
+            full_chain = members[members_start:members_start + members_count]
+            final_forms = members[finals_start:finals_start + finals_count]
+            details = chains.setdefault(self.string(chain_id), {})[full_chain[0]] = {
+                "final_forms": final_forms,
+                "full_chain": full_chain,
+            }
+            if edges_count:
+                edge_names = members[edges_start:edges_start + 2 * edges_count]
+                details["edges"] = [list(edge) for edge in zip(edge_names[::2], edge_names[1::2])]
+        return chains
+
+    def ability_name(self, index):
+        return self.string(self.unpack(ABILITY, "abilities", index)[0])
+
+    def find_ability(self, ability):
+        # Binary search over the sorted ability table
+        count = self.count("abilities")
+        index = bisect.bisect_left(range(count), ability, key=self.ability_name)
+        if index < count and self.ability_name(index) == ability:
+            return index
+        return None
+
+    def ability_texts(self, ability):
+        # {language: flavor text} for one ability
+        index = self.find_ability(ability)
+        if index is None:
+            return {}
+        _, flavor_start, flavor_count = self.unpack(ABILITY, "abilities", index)
+        texts = {}
+        for j in range(flavor_start, flavor_start + flavor_count):
+            language, text = self.unpack(FLAVOR, "flavors", j)
+            texts[self.string(language)] = self.string(text)
+        return texts
+
+    def ability_text(self, ability, language="en"):
+        # Only the requested language's text is decoded
+        index = self.find_ability(ability)
+        if index is None:
+            return None
+        _, flavor_start, flavor_count = self.unpack(ABILITY, "abilities", index)
+        for j in range(flavor_start, flavor_start + flavor_count):
+            language_id, text = self.unpack(FLAVOR, "flavors", j)
+            if self.string(language_id) == language:
+                return self.string(text)
+        return None
+
+    def languages(self):
+        # Every language with at least one flavor text
+        language_ids = {language for language, _ in FLAVOR.iter_unpack(self.section_bytes("flavors"))}
+        return sorted(self.string(language_id) for language_id in language_ids)
+
+
+def open_dataset(data_dir="data"):
+    # The compiled dataset, or None when it is missing or older than any of
+    # the JSON files it was compiled from
+    path = os.path.join(data_dir, DATASET_FILE)
+    try:
+        compiled_mtime = os.path.getmtime(path)
+        for filename in SOURCE_FILES:
+            source = os.path.join(data_dir, filename)
+            if os.path.exists(source) and os.path.getmtime(source) > compiled_mtime:
+                return None
+        return CompiledDataset(path)
+    except (OSError, ValueError) as e:
+        if os.path.exists(path):
+            print(f"Error opening compiled dataset {path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    build_dataset()
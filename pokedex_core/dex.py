@@ -0,0 +1,37 @@
+from . import instrument
+from .search import SearchIndex
+from .selection import Selection
+
+
+@instrument.timed("core.build_dex")
+def build_dex(pokedex, search="", stat_filter="", final_evolutions_only=False,
+              include_chains=False, sort_by=None, search_index=None, stats_table=None):
+    # The names of a regional dex, the same way the picker builds its grid:
+    # search query first, then final evolutions, then the stat filter and
+    # sort. With include_chains every match brings its whole evolution chain
+    # along, like picking in final evolutions mode does. Returns a Selection.
+    if search:
+        search_index = search_index or SearchIndex(pokedex)
+        names = search_index.search(search)
+    else:
+        names = pokedex.names()
+
+    if final_evolutions_only:
+        names = [name for name in names if name in pokedex.final_forms]
+
+    if stat_filter or sort_by:
+        # Only pull NumPy in when stats are actually involved
+        if stats_table is None:
+            from .stats import StatsTable
+            stats_table = StatsTable(pokedex)
+        if stat_filter:
+            names = stats_table.filter(names, stat_filter)
+        if sort_by:
+            names = stats_table.sort(names, sort_by)
+
+    dex = Selection()
+    for name in names:
+        dex.add(name)
+        if include_chains:
+            dex.update(pokedex.chain_members(name))
+    return dex
@@ -0,0 +1,128 @@
+from collections import defaultdict
+
+
+def chain_sort_key(chain_id):
+    # Numeric ids (the API's) in numeric order, then any custom ids
+    chain_id = str(chain_id)
+    return (0, int(chain_id), "") if chain_id.isdigit() else (1, 0, chain_id)
+
+
+def edges_from_preorder(full_chain, final_forms):
+    # Evolution files written before edges were stored only list the members
+    # in preorder plus the final forms, so the edges are reconstructed (best
+    # effort) by walking the preorder with a stack of the current path. After
+    # a final form the walk backs up one level, to a sibling of it (Eevee,
+    # Gloom); a member that still evolves can't sit below stage 2, so it
+    # starts a new branch off the base (Wurmple -> Cascoon).
+    edges = []
+    path = []
+    for name in full_chain:
+        if path and path[-1] in final_forms:
+            path.pop()
+            if name not in final_forms:
+                del path[1:]
+        if path:
+            edges.append((path[-1], name))
+        path.append(name)
+    return edges
+
+
+class EvolutionGraph:
+    # Evolution chains as a directed graph: species are nodes and every
+    # evolution is a parent -> child edge. Stages are the depth from the
+    # chain's base, final forms are the nodes without children, and
+    # ancestor / descendant queries just walk the edges (chains are at most
+    # a few levels deep).
+    def __init__(self):
+        self.parent = {}  # name -> the species it evolves from
+        self.children = defaultdict(list)  # name -> species it evolves into, in chain order
+        self.members = {}  # evolution chain id -> names in preorder
+        self.chain_of = {}  # name -> evolution chain id
+        self.finals = set()  # names that don't evolve any further
+
+    def __contains__(self, name):
+        return name in self.chain_of
+
+    def add_chain(self, chain_id, full_chain, edges=None, final_forms=()):
+        # Also the hook for custom (fakemon) chains that aren't in the data
+        # files; members keep their chain order and duplicates are dropped
+        full_chain = list(dict.fromkeys(full_chain))
+        if edges is None:
+            edges = edges_from_preorder(full_chain, set(final_forms))
+
+        members = self.members.setdefault(chain_id, [])
+        for name in full_chain:
+            if self.chain_of.get(name) != chain_id:
+                members.append(name)
+                self.chain_of[name] = chain_id
+            if not self.children.get(name):
+                self.finals.add(name)
+
+        for parent, child in edges:
+            if self.parent.get(child) == parent:
+                continue
+            self.parent[child] = parent
+            self.children[parent].append(child)
+            self.finals.discard(parent)
+
+    def add_form(self, form, species):
+        # An alternate form joins its species' chain at the same stage, and
+        # is final when the species is; the species' own evolutions are
+        # left as they are
+        chain_id = self.chain_of.get(species)
+        if chain_id is not None and form not in self.chain_of:
+            self.members[chain_id].append(form)
+            self.chain_of[form] = chain_id
+        if species in self.parent:
+            self.parent[form] = self.parent[species]
+        if species in self.finals:
+            self.finals.add(form)
+
+    def chain_members(self, name):
+        chain_id = self.chain_of.get(name)
+        return self.members[chain_id] if chain_id is not None else []
+
+    def chain_edges(self, chain_id):
+        return [
+            (self.parent[name], name)
+            for name in self.members.get(chain_id, [])
+            if name in self.parent
+        ]
+
+    def evolves_from(self, name):
+        return self.parent.get(name)
+
+    def evolves_into(self, name):
+        return self.children.get(name, [])
+
+    def ancestors(self, name):
+        # Nearest first: [parent, grandparent, ...]
+        ancestors = []
+        while name in self.parent and self.parent[name] not in ancestors:
+            name = self.parent[name]
+            ancestors.append(name)
+        return ancestors
+
+    def descendants(self, name):
+        # Every later evolution, in preorder
+        descendants = []
+        pending = list(reversed(self.evolves_into(name)))
+        while pending:
+            child = pending.pop()
+            if child in descendants or child == name:
+                continue
+            descendants.append(child)
+            pending.extend(reversed(self.evolves_into(child)))
+        return descendants
+
+    def final_forms_of(self, name):
+        # The final forms this species can end up as, itself if it doesn't evolve
+        finals = [child for child in self.descendants(name) if child in self.finals]
+        return finals or [name]
+
+    def is_final(self, name):
+        return name in self.finals
+
+    def stage(self, name):
+        # Species outside any chain don't evolve, so they count as stage 1
+        return len(self.ancestors(name)) + 1
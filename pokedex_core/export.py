@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+
+from . import instrument
+from .store import STAT_NAMES
+
+# Default output files of the picker's export buttons
+JSON_EXPORT_FILE = "highlighted_pokemons.json"
+PLAIN_LIST_FILE = "selected_pokemons.txt"
+
+CSV_COLUMNS = ("no", "id", "name", "form", "types") + STAT_NAMES + ("bst", "abilities", "hidden_abilities")
+
+
+# Each writer streams one dex to an open text file, a line (or row) at a
+# time, so a large export never has to be built up as a single string.
+
+def write_json(file, pokedex, names):
+    # Same layout as the picker's export, one name per line
+    file.write('{\n  "highlighted_pokemons": [')
+    empty = True
+    for name in names:
+        file.write(("\n    " if empty else ",\n    ") + json.dumps(name))
+        empty = False
+    file.write("]\n}" if empty else "\n  ]\n}")
+
+
+def write_txt(file, pokedex, names):
+    for i, pokemon_name in enumerate(names):
+        pokemon_data = pokedex.get(pokemon_name)
+        types = ", ".join(pokemon_data.get("types", [])) if pokemon_data else ""
+        types = types or "Unknown"
+        file.write(("\n" if i else "") + f"{pokemon_name} - Types: {types}")
+
+
+def write_csv(file, pokedex, names):
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for position, name in enumerate(names, start=1):
+        entry = pokedex.get(name)
+        if entry is None:
+            writer.writerow([position, "", name] + [""] * (len(CSV_COLUMNS) - 3))
+            continue
+        if not pokedex.has_data(name):
+            # Sprite-only form, no types or stats to write
+            writer.writerow([position, entry["id"], name, entry["form"]] + [""] * (len(CSV_COLUMNS) - 4))
+            continue
+        stats = [entry.get("stats", {}).get(stat, 0) for stat in STAT_NAMES]
+        writer.writerow(
+            [position, entry["id"], name, entry["form"], "/".join(entry.get("types", []))]
+            + stats
+            + [sum(stats), "/".join(entry.get("normal_abilities", [])),
+               "/".join(entry.get("hidden_abilities", []))]
+        )
+
+
+def write_markdown(file, pokedex, names):
+    file.write("| # | Pokémon | Types | HP | ATK | DEF | SpATK | SpDEF | SPE | BST |\n")
+    file.write("|--:|---|---|--:|--:|--:|--:|--:|--:|--:|\n")
+    for position, name in enumerate(names, start=1):
+        entry = pokedex.get(name)
+        if entry is None or not pokedex.has_data(name):
+            file.write(f"| {position} | {name} | Unknown |" + " |" * 7 + "\n")
+            continue
+        stats = [entry.get("stats", {}).get(stat, 0) for stat in STAT_NAMES]
+        types = ", ".join(entry.get("types", []))
+        columns = " | ".join(str(value) for value in stats + [sum(stats)])
+        file.write(f"| {position} | {name} | {types} | {columns} |\n")
+
+
+# format -> (file extension, writer)
+FORMATS = {
+    "json": (".json", write_json),
+    "txt": (".txt", write_txt),
+    "csv": (".csv", write_csv),
+    "md": (".md", write_markdown),
+}
+
+
+def render_export(export_format, pokedex, names):
+    buffer = io.StringIO()
+    FORMATS[export_format][1](buffer, pokedex, names)
+    return buffer.getvalue()
+
+
+@instrument.timed("core.export_dex")
+def export_dex(path, export_format, pokedex, names):
+    with open(path, "w", newline="") as file:
+        FORMATS[export_format][1](file, pokedex, names)
+    return path
+
+
+def render_json_export(names):
+    return render_export("json", None, names)
+
+
+def render_plain_list(pokedex, names):
+    return render_export("txt", pokedex, names)
+
+
+def write_export(path, export_format, pokedex, names, description):
+    try:
+        export_dex(path, export_format, pokedex, names)
+        return True
+    except Exception as e:
+        print(f"Error saving {description} file: {e}")
+        return False
+
+
+def write_json_export(names, path=JSON_EXPORT_FILE):
+    return write_export(path, "json", None, names, "JSON")
+
+
+def write_plain_list(pokedex, names, path=PLAIN_LIST_FILE):
+    return write_export(path, "txt", pokedex, names, "plain list")
+
+
+def read_json_export(path=JSON_EXPORT_FILE):
+    # Names of a file written by write_json_export, None if it can't be read
+    try:
+        with open(path, "r") as file:
+            return list(json.load(file)["highlighted_pokemons"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error reading JSON export {path}: {e}")
+        return None
@@ -0,0 +1,183 @@
+from collections import Counter
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from .json_io import write_json_atomic
+
+# Opt-in instrumentation, off unless one of these is set (or the same
+# files are passed to enable(), which is what the --metrics / --profile
+# command line flags do):
+#
+#   POKEDEX_METRICS=metrics.json   counters and timing histograms of the hot
+#                                  paths, written on exit ("-" for stderr)
+#   POKEDEX_PROFILE=run.prof       a cProfile of the main thread from the
+#                                  moment it is enabled, written on exit, to
+#                                  read with pstats
+#
+# When disabled, timer() returns a shared no-op context manager and timed()
+# functions only pay for one flag check.
+ENABLED = False
+
+# Upper bounds of the histogram buckets in milliseconds, doubling from
+# 0.05 ms to about 26 s, plus one overflow bucket
+BUCKET_BOUNDS = tuple(0.05 * 2 ** i for i in range(20))
+
+NULL_TIMER = contextlib.nullcontext()
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        for i, bound in enumerate(BUCKET_BOUNDS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, percent):
+        # Upper bound of the bucket holding the percentile, capped at the max
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS + (self.max,), self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0,
+            "min_ms": round(self.min, 3) if self.count else 0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "buckets": {
+                f"<={bound:g}" if i < len(BUCKET_BOUNDS) else "more": count
+                for i, (bound, count) in enumerate(zip(BUCKET_BOUNDS + (None,), self.buckets))
+                if count
+            },
+        }
+
+
+class Metrics:
+    # Shared by every thread (the sprite decoders and fetch workers record
+    # from their own threads)
+    def __init__(self):
+        self.counters = Counter()
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def record(self, name, ms):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(ms)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "histograms": {name: self.histograms[name].summary() for name in sorted(self.histograms)},
+            }
+
+
+metrics = Metrics()
+
+
+class Timer:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        metrics.record(self.name, (time.perf_counter() - self.start) * 1000)
+
+
+def timer(name):
+    # with timer("picker.load.store"): ...
+    return Timer(name) if ENABLED else NULL_TIMER
+
+
+def timed(name):
+    # Decorator recording every call of the function under name
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+
+def count(name, amount=1):
+    if ENABLED:
+        metrics.count(name, amount)
+
+
+def dump_metrics(path):
+    snapshot = metrics.snapshot()
+    if path == "-":
+        json.dump(snapshot, sys.stderr, indent=2)
+        sys.stderr.write("\n")
+    else:
+        write_json_atomic(path, snapshot, indent=2)
+        print(f"Metrics saved to {path}", file=sys.stderr)
+
+
+def start_profiler(path):
+    import cProfile
+    profiler = cProfile.Profile()
+
+    def save():
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile saved to {path}", file=sys.stderr)
+
+    atexit.register(save)
+    profiler.enable()
+    return profiler
+
+
+def enable(metrics_file=None, profile_file=None):
+    global ENABLED
+    if metrics_file and not ENABLED:
+        ENABLED = True
+        atexit.register(dump_metrics, metrics_file)
+    if profile_file:
+        start_profiler(profile_file)
+
+
+enable(os.environ.get("POKEDEX_METRICS"), os.environ.get("POKEDEX_PROFILE"))
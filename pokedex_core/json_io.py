@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+
+# mkstemp creates files readable by the owner only; replaced files get the
+# mode of the file they replace, new ones the usual umask default. The umask
+# can only be read by setting it, so that happens once, at import, before
+# any worker threads exist.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def replace_file(tmp_path, path):
+    # Rename a finished temporary file over path, keeping path's mode
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    # Write to a temporary file next to the target and rename it over the
+    # target, so readers never see a half-written file
+    write_json_stream(path, json.JSONEncoder(**dump_kwargs).iterencode(data))
+
+
+def load_json_file(path, default=None):
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def write_json_stream(path, parts):
+    # Atomically write a file from an iterable of already encoded strings
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as file:
+            for part in parts:
+                file.write(part)
+        replace_file(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def encode_compact(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+def write_json_array(path, values):
+    # Compact JSON array written one element at a time, so the values can
+    # come from a generator and never all be in memory
+    def parts():
+        yield "["
+        for i, value in enumerate(values):
+            yield ("," if i else "") + encode_compact(value)
+        yield "]"
+    write_json_stream(path, parts())
+
+
+def write_json_object(path, pairs):
+    # Compact JSON object from (key, value) pairs, same streaming as above
+    def parts():
+        yield "{"
+        for i, (key, value) in enumerate(pairs):
+            yield ("," if i else "") + encode_compact(str(key)) + ":" + encode_compact(value)
+        yield "}"
+    write_json_stream(path, parts())
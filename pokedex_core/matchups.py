@@ -0,0 +1,211 @@
+import numpy as np
+
+from .store import TYPE_NAMES
+
+# Attacking type -> defending type -> multiplier, for every matchup that
+# isn't neutral (type chart of generation 6 onwards)
+TYPE_CHART = {
+    "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
+    "fire": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 2, "bug": 2, "rock": 0.5, "dragon": 0.5, "steel": 2},
+    "water": {"fire": 2, "water": 0.5, "grass": 0.5, "ground": 2, "rock": 2, "dragon": 0.5},
+    "electric": {"water": 2, "electric": 0.5, "grass": 0.5, "ground": 0, "flying": 2, "dragon": 0.5},
+    "grass": {
+        "fire": 0.5, "water": 2, "grass": 0.5, "poison": 0.5, "ground": 2, "flying": 0.5,
+        "bug": 0.5, "rock": 2, "dragon": 0.5, "steel": 0.5,
+    },
+    "ice": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 0.5, "ground": 2, "flying": 2, "dragon": 2, "steel": 0.5},
+    "fighting": {
+        "normal": 2, "ice": 2, "poison": 0.5, "flying": 0.5, "psychic": 0.5, "bug": 0.5,
+        "rock": 2, "ghost": 0, "dark": 2, "steel": 2, "fairy": 0.5,
+    },
+    "poison": {"grass": 2, "poison": 0.5, "ground": 0.5, "rock": 0.5, "ghost": 0.5, "steel": 0, "fairy": 2},
+    "ground": {"fire": 2, "electric": 2, "grass": 0.5, "poison": 2, "flying": 0, "bug": 0.5, "rock": 2, "steel": 2},
+    "flying": {"electric": 0.5, "grass": 2, "fighting": 2, "bug": 2, "rock": 0.5, "steel": 0.5},
+    "psychic": {"fighting": 2, "poison": 2, "psychic": 0.5, "dark": 0, "steel": 0.5},
+    "bug": {
+        "fire": 0.5, "grass": 2, "fighting": 0.5, "poison": 0.5, "flying": 0.5, "psychic": 2,
+        "ghost": 0.5, "dark": 2, "steel": 0.5, "fairy": 0.5,
+    },
+    "rock": {"fire": 2, "ice": 2, "fighting": 0.5, "ground": 0.5, "flying": 2, "bug": 2, "steel": 0.5},
+    "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": 0.5},
+    "dragon": {"dragon": 2, "steel": 0.5, "fairy": 0},
+    "dark": {"fighting": 0.5, "psychic": 2, "ghost": 2, "dark": 0.5, "fairy": 0.5},
+    "steel": {"fire": 0.5, "water": 0.5, "electric": 0.5, "ice": 2, "rock": 2, "steel": 0.5, "fairy": 2},
+    "fairy": {"fire": 0.5, "fighting": 2, "poison": 0.5, "dragon": 2, "dark": 2, "steel": 0.5},
+}
+
+TYPE_INDEX = {type_name: i for i, type_name in enumerate(TYPE_NAMES)}
+NUM_TYPES = len(TYPE_NAMES)
+
+# MATCHUPS[attacking type, defending type]
+MATCHUPS = np.ones((NUM_TYPES, NUM_TYPES), dtype=np.float32)
+for attacker, row in TYPE_CHART.items():
+    for defender, multiplier in row.items():
+        MATCHUPS[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = multiplier
+
+# Defensive profiles are single or dual typings, numbered first * 18 + second
+# with the types in TYPE_NAMES order; a single type is (type, type).
+# PROFILE_MATCHUPS[attacking type, profile] multiplies both types' matchups.
+NUM_PROFILES = NUM_TYPES * NUM_TYPES
+PROFILE_MATCHUPS = (MATCHUPS[:, :, None] * MATCHUPS[:, None, :]).reshape(NUM_TYPES, NUM_PROFILES)
+PROFILE_MATCHUPS[:, np.arange(NUM_TYPES) * (NUM_TYPES + 1)] = MATCHUPS
+
+# Profile counts times these give, per attacking type, how many Pokémon are
+# weak to it, resist it (immunities included) or are immune to it
+WEAK = (PROFILE_MATCHUPS > 1).astype(np.int32)
+RESIST = (PROFILE_MATCHUPS < 1).astype(np.int32)
+IMMUNE = (PROFILE_MATCHUPS == 0).astype(np.int32)
+# PROFILE_TYPES[type, profile] is 1 when the profile has that type
+PROFILE_TYPES = np.zeros((NUM_TYPES, NUM_PROFILES), dtype=np.int32)
+for profile in range(NUM_PROFILES):
+    first, second = divmod(profile, NUM_TYPES)
+    PROFILE_TYPES[first, profile] = PROFILE_TYPES[second, profile] = 1
+
+
+def profile_of(types):
+    # Profile number of a list of type names, -1 when none is known
+    indexes = sorted(TYPE_INDEX[t] for t in types if t in TYPE_INDEX)[:2]
+    if not indexes:
+        return -1
+    return indexes[0] * NUM_TYPES + indexes[-1]
+
+
+def profile_name(profile):
+    first, second = divmod(int(profile), NUM_TYPES)
+    return TYPE_NAMES[first] if first == second else f"{TYPE_NAMES[first]}/{TYPE_NAMES[second]}"
+
+
+class TypeMatchups:
+    # The defensive profile of every entry of the dex, so matchup questions
+    # over any list of names are array lookups against the precomputed
+    # charts above.
+    def __init__(self, pokedex):
+        entries = list(pokedex)
+        self.names = [entry["name"] for entry in entries]
+        self.rows = {name: i for i, name in enumerate(self.names)}
+        self.profiles = np.fromiter(
+            (profile_of(entry.get("types", [])) for entry in entries), dtype=np.int16, count=len(entries)
+        )
+        # How common every profile is in the whole dex, the baseline for
+        # spotting over-represented ones
+        self.baseline = self.profile_counts(self.names)
+
+    def profiles_of(self, names):
+        rows = np.fromiter((self.rows.get(name, -1) for name in names), dtype=np.intp)
+        profiles = self.profiles[rows[rows >= 0]]
+        return profiles[profiles >= 0]
+
+    def profile_counts(self, names):
+        return np.bincount(self.profiles_of(names), minlength=NUM_PROFILES).astype(np.int32)
+
+    def defense(self, name):
+        # Attacking type -> multiplier against name, for the non-neutral ones
+        profile = self.profiles[self.rows[name]] if name in self.rows else -1
+        if profile < 0:
+            return {}
+        column = PROFILE_MATCHUPS[:, profile]
+        return {TYPE_NAMES[i]: float(column[i]) for i in np.flatnonzero(column != 1)}
+
+    def coverage(self, names=(), selection=None):
+        return TeamCoverage(self, names, selection)
+
+
+class TeamCoverage:
+    # Profile counts of a group of Pokémon (a filter result, or a selection
+    # it follows through its (added, removed) deltas); every question below
+    # is one small matrix product over the 324 profile counts, whatever the
+    # size of the group.
+    def __init__(self, matchups, names=(), selection=None):
+        self.matchups = matchups
+        self.counts = matchups.profile_counts(names)
+        if selection is not None:
+            self.on_selection_changed(list(selection), [])
+            selection.subscribe(self.on_selection_changed)
+
+    def on_selection_changed(self, added, removed):
+        if added:
+            np.add.at(self.counts, self.matchups.profiles_of(added), 1)
+        if removed:
+            np.subtract.at(self.counts, self.matchups.profiles_of(removed), 1)
+
+    def total(self):
+        return int(self.counts.sum())
+
+    def defense_counts(self):
+        # Attacking type -> (weak, resisting, immune) Pokémon counts
+        weak, resist, immune = WEAK @ self.counts, RESIST @ self.counts, IMMUNE @ self.counts
+        return {
+            type_name: (int(weak[i]), int(resist[i]), int(immune[i]))
+            for i, type_name in enumerate(TYPE_NAMES)
+        }
+
+    def unresisted(self):
+        # Attacking types nothing in the group resists or is immune to
+        if not self.total():
+            return []
+        return [TYPE_NAMES[i] for i in np.flatnonzero(RESIST @ self.counts == 0)]
+
+    def most_threatening(self, limit=3):
+        # Attacking types more of the group is weak to than resists, as
+        # (type, weak minus resisting), worst first
+        weak = WEAK @ self.counts - RESIST @ self.counts
+        order = np.argsort(-weak, kind="stable")[:limit]
+        return [(TYPE_NAMES[i], int(weak[i])) for i in order if weak[i] > 0]
+
+    def offense(self):
+        # Defending type -> best multiplier among the group's own types
+        # (same-type attacks), 0 for types none of them can touch
+        present = np.flatnonzero(PROFILE_TYPES @ self.counts)
+        if not len(present):
+            return {}
+        best = MATCHUPS[present].max(axis=0)
+        return {type_name: float(best[i]) for i, type_name in enumerate(TYPE_NAMES)}
+
+    def unhit(self):
+        # Defending types none of the group's types hit super effectively
+        offense = self.offense()
+        return [type_name for type_name, multiplier in offense.items() if multiplier <= 1]
+
+    def over_represented(self, factor=2.0, minimum=3):
+        # Profiles whose share of the group is at least factor times their
+        # share of the whole dex, as (profile, count, ratio), largest first
+        total, baseline_total = self.total(), int(self.matchups.baseline.sum())
+        if not total or not baseline_total:
+            return []
+        shares = self.counts / total
+        baseline = self.matchups.baseline / baseline_total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(baseline > 0, shares / baseline, 0)
+        profiles = np.flatnonzero((self.counts >= minimum) & (ratios >= factor))
+        profiles = profiles[np.argsort(-self.counts[profiles], kind="stable")]
+        return [(profile_name(p), int(self.counts[p]), round(float(ratios[p]), 2)) for p in profiles]
+
+    def summary(self):
+        return {
+            "count": self.total(),
+            "defense": {
+                type_name: {"weak": weak, "resist": resist, "immune": immune}
+                for type_name, (weak, resist, immune) in self.defense_counts().items()
+            },
+            "unresisted": self.unresisted(),
+            "unhit": self.unhit(),
+            "over_represented": [
+                {"profile": profile, "count": count, "ratio": ratio}
+                for profile, count, ratio in self.over_represented()
+            ],
+        }
+
+    def report(self):
+        # Short plain-text version of the summary for the GUI
+        if not self.total():
+            return "Type coverage: nothing selected"
+        lines = [
+            f"Nothing resists: {', '.join(self.unresisted()) or 'none'}",
+            f"Most weak to: {', '.join(f'{t} ({n})' for t, n in self.most_threatening()) or 'none'}",
+            f"No super effective STAB on: {', '.join(self.unhit()) or 'none'}",
+        ]
+        over = self.over_represented()
+        if over:
+            lines.append("Over-represented typings:")
+            lines.extend(f"  {profile:<18}{count:>4} ({ratio:.1f}x)" for profile, count, ratio in over[:5])
+        return "\n".join(lines)
@@ -0,0 +1,159 @@
+import random
+
+
+class Node:
+    __slots__ = ("name", "priority", "size", "left", "right", "parent")
+
+    def __init__(self, name):
+        self.name = name
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+def size(node):
+    return node.size if node is not None else 0
+
+
+def update(node):
+    # Recompute the subtree size and point the children back at node
+    node.size = 1 + size(node.left) + size(node.right)
+    if node.left is not None:
+        node.left.parent = node
+    if node.right is not None:
+        node.right.parent = node
+
+
+def merge(left, right):
+    # Every node of left ends up before every node of right
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge(left.right, right)
+        update(left)
+        return left
+    right.left = merge(left, right.left)
+    update(right)
+    return right
+
+
+def split(node, count):
+    # (the first count nodes, the rest)
+    if node is None:
+        return None, None
+    if size(node.left) >= count:
+        left, node.left = split(node.left, count)
+        update(node)
+        return left, node
+    node.right, right = split(node.right, count - size(node.left) - 1)
+    update(node)
+    return node, right
+
+
+class RegionalOrder:
+    # The numbering of a regional dex: an ordered list of unique names kept
+    # in an implicit treap (a randomized balanced tree keyed by position),
+    # so inserting, removing and moving a name, looking up the name at a
+    # position and the position of a name are all O(log n). A list would
+    # make every one of those but the lookup by position O(n).
+    def __init__(self, names=()):
+        self.root = None
+        self.nodes = {}
+        self.extend(names)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, name):
+        return name in self.nodes
+
+    def __iter__(self):
+        # In-order walk without recursion
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.name
+            node = node.right
+
+    def __repr__(self):
+        return f"RegionalOrder({self.to_list()!r})"
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.nodes)
+        if not 0 <= index < len(self.nodes):
+            raise IndexError("regional dex index out of range")
+        node = self.root
+        while True:
+            left = size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node.name
+            else:
+                index -= left + 1
+                node = node.right
+
+    def index(self, name):
+        # Position of name, counting the nodes before it on the way up
+        node = self.nodes[name]
+        position = size(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                position += size(node.parent.left) + 1
+            node = node.parent
+        return position
+
+    def set_root(self, root):
+        if root is not None:
+            root.parent = None
+        self.root = root
+
+    def insert(self, name, index=None):
+        # Insert name before position index (at the end when None)
+        if name in self.nodes:
+            raise ValueError(f"{name} is already in the regional dex")
+        node = self.nodes[name] = Node(name)
+        if index is None or index >= len(self.nodes) - 1:
+            self.set_root(merge(self.root, node))
+            return
+        left, right = split(self.root, max(0, index))
+        self.set_root(merge(merge(left, node), right))
+
+    def append(self, name):
+        self.insert(name)
+
+    def extend(self, names):
+        for name in names:
+            if name not in self.nodes:
+                self.insert(name)
+
+    def remove(self, name):
+        # Returns the position name was at
+        position = self.index(name)
+        left, rest = split(self.root, position)
+        node, right = split(rest, 1)
+        del self.nodes[name]
+        node.parent = None
+        self.set_root(merge(left, right))
+        return position
+
+    def discard(self, name):
+        if name in self.nodes:
+            self.remove(name)
+
+    def move(self, name, index):
+        # Move name to position index; returns its old position
+        position = self.remove(name)
+        self.insert(name, index)
+        return position
+
+    def to_list(self):
+        return list(self)
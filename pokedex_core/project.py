@@ -0,0 +1,283 @@
+import json
+import os
+
+from .export import read_json_export
+from .json_io import write_json_atomic
+from .order import RegionalOrder
+from .selection import Selection
+
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".pdex"
+JOURNAL_SUFFIX = ".journal"
+DEFAULT_PROJECT = "projects/default.pdex"
+DEFAULT_DEX = "My Dex"
+
+# Journal lines written before the journal is folded into the snapshot
+COMPACT_EVERY = 500
+
+
+def load_snapshot(path):
+    # None when there is no snapshot yet. One that can't be read raises
+    # rather than opening as an empty project that would overwrite it.
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        raise ValueError(f"{path} is not a valid project file: {e}")
+    if not isinstance(snapshot, dict):
+        raise ValueError(f"{path} is not a valid project file")
+    return snapshot
+
+
+class Dex:
+    # One regional dex: the selected names, their regional numbering, a
+    # note per Pokémon and a free-form description. Newly selected names
+    # are numbered after the others.
+    def __init__(self, name, entries=(), notes=None, description=""):
+        self.name = name
+        self.entries = Selection(entries)
+        self.order = RegionalOrder(self.entries)
+        self.entries.subscribe(self.on_entries_changed)
+        self.notes = dict(notes or {})
+        self.description = description
+
+    def on_entries_changed(self, added, removed):
+        self.order.extend(added)
+        for name in removed:
+            self.order.remove(name)
+
+    def number(self, name):
+        # Regional dex number, from 1
+        return self.order.index(name) + 1
+
+    def to_json(self):
+        return {
+            "description": self.description,
+            "entries": self.order.to_list(),
+            "notes": self.notes,
+        }
+
+
+class Project:
+    # Several named dexes saved as a JSON snapshot (<name>.pdex) plus an
+    # append-only journal of changes (<name>.pdex.journal), one short JSON
+    # line per change:
+    #
+    #   ["add", dex, [names]]       ["remove", dex, [names]]
+    #   ["move", dex, name, index]  ["note", dex, name, text]
+    #   ["create", dex]             ["delete", dex]
+    #   ["rename", old, new]        ["describe", dex, text]
+    #   ["active", dex]
+    #
+    # Saving a click appends a few bytes instead of rewriting the project.
+    # Opening loads the snapshot and replays the journal; the journal is
+    # folded into the snapshot (compacted) every COMPACT_EVERY lines and on
+    # close. Every compaction bumps the snapshot's generation, and the
+    # journal starts with a ["generation", n] line naming the snapshot it
+    # follows. A journal older than the snapshot (a crash between writing
+    # the snapshot and emptying the journal) is already in the snapshot and
+    # is not replayed, since renames and moves can't be applied twice.
+    #
+    # A read-only project replays the journal without touching either file;
+    # its changes aren't saved. A project with no path only lives in memory.
+    def __init__(self, path=DEFAULT_PROJECT, read_only=False):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX if path is not None else None
+        self.read_only = read_only or path is None
+        self.dexes = {}
+        self.active = None
+        self.generation = 0
+        self.journal = None
+        self.journal_lines = 0
+        self.replaying = False
+
+        snapshot = load_snapshot(path) if path is not None else None
+        if snapshot is not None:
+            if snapshot.get("version") != PROJECT_VERSION:
+                raise ValueError(f"{path} is not a version {PROJECT_VERSION} project")
+            for name, dex in snapshot.get("dexes", {}).items():
+                self.attach(Dex(name, dex.get("entries", []), dex.get("notes"), dex.get("description", "")))
+            self.active = snapshot.get("active")
+            self.generation = snapshot.get("generation", 0)
+
+        self.replay_journal()
+        if not self.dexes:
+            self.create_dex(DEFAULT_DEX)
+        if self.active not in self.dexes:
+            self.active = next(iter(self.dexes))
+
+    def replay_journal(self):
+        offset = 0
+        if self.journal_path is not None and os.path.exists(self.journal_path):
+            self.replaying = True
+            try:
+                with open(self.journal_path, "rb") as file:
+                    for line in file:
+                        try:
+                            if not line.endswith(b"\n"):
+                                raise ValueError("unterminated line")
+                            op, *args = json.loads(line)
+                        except ValueError:
+                            # Cut short by a crash, drop it and what follows
+                            break
+                        if op == "generation":
+                            if args[0] < self.generation:
+                                # Already compacted into the snapshot
+                                offset = 0
+                                break
+                        else:
+                            self.apply(op, *args)
+                            self.journal_lines += 1
+                        offset += len(line)
+            finally:
+                self.replaying = False
+            if not self.read_only:
+                with open(self.journal_path, "r+b") as file:
+                    file.truncate(offset)
+        if self.read_only:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+        if offset == 0:
+            self.start_journal()
+
+    def start_journal(self):
+        self.journal.write(json.dumps(["generation", self.generation]) + "\n")
+        self.journal.flush()
+        self.journal_lines = 0
+
+    def log(self, op, *args):
+        if self.replaying or self.journal is None:
+            return
+        self.journal.write(json.dumps([op, *args], separators=(",", ":")) + "\n")
+        self.journal.flush()
+        self.journal_lines += 1
+        if self.journal_lines >= COMPACT_EVERY:
+            self.compact()
+
+    def apply(self, op, *args):
+        # Apply one journal entry; also what every mutation below goes through
+        if op == "create":
+            if args[0] not in self.dexes:
+                self.attach(Dex(args[0]))
+        elif op == "delete":
+            self.dexes.pop(args[0], None)
+        elif op == "rename":
+            old, new = args
+            if old in self.dexes and new not in self.dexes:
+                # Keep the dex's position among the others
+                self.dexes = {new if name == old else name: dex for name, dex in self.dexes.items()}
+                self.dexes[new].name = new
+                if self.active == old:
+                    self.active = new
+        elif op == "active":
+            self.active = args[0]
+        elif args and args[0] in self.dexes:
+            dex = self.dexes[args[0]]
+            if op == "add":
+                dex.entries.update(args[1])
+            elif op == "remove":
+                dex.entries.difference_update(args[1])
+            elif op == "move":
+                if args[1] in dex.order:
+                    dex.order.move(args[1], args[2])
+            elif op == "note":
+                if args[2]:
+                    dex.notes[args[1]] = args[2]
+                else:
+                    dex.notes.pop(args[1], None)
+            elif op == "describe":
+                dex.description = args[1]
+
+    def attach(self, dex):
+        self.dexes[dex.name] = dex
+        dex.entries.subscribe(lambda added, removed: self.on_entries_changed(dex, added, removed))
+
+    def on_entries_changed(self, dex, added, removed):
+        # Selections are journaled whoever changes them
+        if dex.name not in self.dexes or self.dexes[dex.name] is not dex:
+            return
+        if added:
+            self.log("add", dex.name, added)
+        if removed:
+            self.log("remove", dex.name, removed)
+
+    def change(self, op, *args):
+        self.apply(op, *args)
+        self.log(op, *args)
+
+    def active_dex(self):
+        return self.dexes[self.active]
+
+    def names(self):
+        return list(self.dexes)
+
+    def create_dex(self, name, entries=()):
+        if name in self.dexes:
+            raise ValueError(f"There is already a dex named {name!r}")
+        self.change("create", name)
+        self.dexes[name].entries.update(entries)
+        if self.active is None:
+            self.set_active(name)
+        return self.dexes[name]
+
+    def import_export(self, path, name=None):
+        # A highlighted_pokemons.json export as a new dex named after the file
+        names = read_json_export(path)
+        if names is None:
+            return None
+        base = name or os.path.splitext(os.path.basename(path))[0]
+        name, n = base, 2
+        while name in self.dexes:
+            name, n = f"{base} ({n})", n + 1
+        return self.create_dex(name, names)
+
+    def delete_dex(self, name):
+        self.change("delete", name)
+        if not self.dexes:
+            self.create_dex(DEFAULT_DEX)
+        if self.active == name:
+            self.set_active(next(iter(self.dexes)))
+
+    def rename_dex(self, old, new):
+        if new in self.dexes:
+            raise ValueError(f"There is already a dex named {new!r}")
+        self.change("rename", old, new)
+
+    def set_active(self, name):
+        if name not in self.dexes:
+            raise KeyError(name)
+        if name != self.active:
+            self.change("active", name)
+
+    def move(self, name, index, dex=None):
+        self.change("move", dex or self.active, name, index)
+
+    def set_note(self, name, text, dex=None):
+        self.change("note", dex or self.active, name, text.strip())
+
+    def describe(self, text, dex=None):
+        self.change("describe", dex or self.active, text)
+
+    def to_json(self):
+        return {
+            "version": PROJECT_VERSION,
+            "generation": self.generation,
+            "active": self.active,
+            "dexes": {name: dex.to_json() for name, dex in self.dexes.items()},
+        }
+
+    def compact(self):
+        # Snapshot first, then empty the journal
+        self.generation += 1
+        write_json_atomic(self.path, self.to_json())
+        self.journal.close()
+        self.journal = open(self.journal_path, "w", encoding="utf-8")
+        self.start_journal()
+
+    def close(self):
+        if self.journal is not None and not self.journal.closed:
+            self.compact()
+            self.journal.close()
@@ -0,0 +1,82 @@
+from collections import defaultdict
+
+# Longest n-gram stored in the index; longer queries intersect their n-grams
+NGRAM_SIZE = 3
+
+# Query prefixes that search a field other than the name, e.g. "type:fire"
+SEARCH_FIELDS = ("name", "type", "ability")
+
+
+def ngrams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class SearchIndex:
+    # Substring search over the Pokédex backed by an n-gram index. Every
+    # 1..NGRAM_SIZE character slice of a field points to the names containing
+    # it, so a query only has to verify the few candidates sharing all its
+    # n-grams. When a query extends the previous one (the user typed another
+    # character) the previous result set is refined instead.
+    def __init__(self, pokedex):
+        self.order = {}  # name -> dex position, results are returned in dex order
+        self.texts = {field: {} for field in SEARCH_FIELDS}
+        self.grams = {field: defaultdict(set) for field in SEARCH_FIELDS}
+        self.last_query = None
+        self.last_results = None
+
+        for entry in pokedex:
+            self.add(entry)
+
+    def add(self, entry):
+        name = entry["name"]
+        self.order[name] = len(self.order)
+        self.index_text("name", name, name)
+        self.index_text("type", name, " ".join(entry.get("types", [])))
+        self.index_text(
+            "ability", name,
+            " ".join(entry.get("normal_abilities", []) + entry.get("hidden_abilities", [])),
+        )
+        self.last_query = self.last_results = None
+
+    def index_text(self, field, name, text):
+        self.texts[field][name] = text
+        for size in range(1, NGRAM_SIZE + 1):
+            for gram in ngrams(text, size):
+                self.grams[field][gram].add(name)
+
+    def parse_query(self, query):
+        field, sep, text = query.partition(":")
+        if sep and field in SEARCH_FIELDS:
+            return field, text.strip()
+        return "name", query
+
+    def search(self, query):
+        query = query.strip().lower()
+        field, text = self.parse_query(query)
+        if not text:
+            results = sorted(self.order, key=self.order.get)
+        elif self.last_query is not None and self.refines(query):
+            # Appending characters can only shrink the previous results
+            texts = self.texts[field]
+            results = [name for name in self.last_results if text in texts[name]]
+        else:
+            results = self.lookup(field, text)
+
+        self.last_query, self.last_results = query, results
+        return results
+
+    def refines(self, query):
+        last_field, last_text = self.parse_query(self.last_query)
+        field, text = self.parse_query(query)
+        return field == last_field and last_text and last_text in text
+
+    def lookup(self, field, text):
+        grams = self.grams[field]
+        size = min(len(text), NGRAM_SIZE)
+        # Start from the rarest n-gram to keep the intersection small
+        postings = sorted((grams.get(gram, set()) for gram in ngrams(text, size)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        if len(text) > NGRAM_SIZE:
+            texts = self.texts[field]
+            candidates = {name for name in candidates if text in texts[name]}
+        return sorted(candidates, key=self.order.get)
@@ -0,0 +1,81 @@
+class Selection:
+    # Insertion-ordered set of selected Pokémon names. Membership tests,
+    # adds and removes are O(1) (a dict keeps the order). Every mutation
+    # reports the names whose state actually changed, both as its return
+    # value and to the subscribed listeners as one (added, removed) batch.
+    def __init__(self, names=()):
+        self.items = dict.fromkeys(names)
+        self.listeners = []
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"Selection({list(self.items)!r})"
+
+    def subscribe(self, listener):
+        # listener(added, removed) is called once per mutation that changed something
+        self.listeners.append(listener)
+
+    def notify(self, added, removed):
+        if added or removed:
+            for listener in self.listeners:
+                listener(added, removed)
+
+    def add(self, name):
+        return bool(self.update([name]))
+
+    def discard(self, name):
+        return bool(self.difference_update([name]))
+
+    def update(self, names):
+        added = [name for name in dict.fromkeys(names) if name not in self.items]
+        for name in added:
+            self.items[name] = None
+        self.notify(added, [])
+        return added
+
+    def difference_update(self, names):
+        removed = [name for name in dict.fromkeys(names) if name in self.items]
+        for name in removed:
+            del self.items[name]
+        self.notify([], removed)
+        return removed
+
+    def clear(self):
+        removed = list(self.items)
+        self.items.clear()
+        self.notify([], removed)
+        return removed
+
+    def invert(self, names):
+        # Flip the state of every given name in a single batch
+        added, removed = [], []
+        for name in dict.fromkeys(names):
+            if name in self.items:
+                del self.items[name]
+                removed.append(name)
+            else:
+                self.items[name] = None
+                added.append(name)
+        self.notify(added, removed)
+        return added, removed
+
+    def replace(self, names):
+        # Become exactly names, in that order, with a single notification
+        # (loading a saved dex restyles the grid once, not per name)
+        names = dict.fromkeys(names)
+        added = [name for name in names if name not in self.items]
+        removed = [name for name in self.items if name not in names]
+        self.items = names
+        self.notify(added, removed)
+        return added, removed
+
+    def to_list(self):
+        return list(self.items)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import struct
+
+from .json_io import load_json_file, write_json_atomic
+
+SPRITE_DIR = "data/images/pokemons"
+MANIFEST_FILE = "data/images/sprite_manifest.json"
+MANIFEST_VERSION = 1
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Signature, IHDR chunk length and type, then width and height
+PNG_HEADER = struct.Struct(">8sI4sII")
+
+
+def png_size(path):
+    # (width, height) read from the IHDR chunk, None if it isn't a PNG
+    with open(path, "rb") as file:
+        header = file.read(PNG_HEADER.size)
+    if len(header) < PNG_HEADER.size:
+        return None
+    signature, _, chunk_type, width, height = PNG_HEADER.unpack(header)
+    if signature != PNG_SIGNATURE or chunk_type != b"IHDR":
+        return None
+    return width, height
+
+
+def file_hash(path):
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def parse_sprite_key(key):
+    # "25" -> (25, ""), "150-mega-x" -> (150, "mega-x"), None for other names
+    number, _, form = key.partition("-")
+    return (int(number), form) if number.isdigit() else None
+
+
+def build_sprite_manifest(sprite_dir=SPRITE_DIR, manifest_path=MANIFEST_FILE, previous=None):
+    # Scan the sprite directory once. Files whose mtime and size match the
+    # previous manifest keep their hash and dimensions, so a rebuild after
+    # adding a few sprites only reads those.
+    known = (previous or {}).get("sprites", {})
+    sprites, invalid = {}, []
+    with os.scandir(sprite_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".png") or not entry.is_file():
+                continue
+            key = entry.name[:-4]
+            parsed = parse_sprite_key(key)
+            if parsed is None:
+                continue
+            stat = entry.stat()
+            old = known.get(key)
+            if old and old["mtime"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+                sprites[key] = old
+                continue
+            size = png_size(entry.path)
+            if size is None:
+                invalid.append(key)
+                continue
+            sprites[key] = {
+                "id": parsed[0],
+                "form": parsed[1],
+                "path": f"{sprite_dir}/{entry.name}",
+                "width": size[0],
+                "height": size[1],
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "sha1": file_hash(entry.path),
+            }
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "sprite_dir": sprite_dir,
+        "dir_mtime": os.stat(sprite_dir).st_mtime_ns,
+        "sprites": sprites,
+        "invalid": sorted(invalid),
+    }
+    write_json_atomic(manifest_path, manifest)
+    if invalid:
+        print(f"Skipped {len(invalid)} sprites that aren't valid PNG files: {', '.join(sorted(invalid))}")
+    return manifest
+
+
+class SpriteManifest:
+    # Every sprite on disk by key ("25", "10034", "201-a"), with its dex id,
+    # form, dimensions and hash, so looking a sprite up (or finding out it is
+    # missing) is a dict hit instead of a filesystem probe.
+    def __init__(self, manifest):
+        self.sprites = manifest.get("sprites", {})
+        self.invalid = manifest.get("invalid", [])
+        self.by_form = {(sprite["id"], sprite["form"]): key for key, sprite in self.sprites.items()}
+
+    def __contains__(self, key):
+        return key in self.sprites
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def get(self, key):
+        return self.sprites.get(key)
+
+    def key_for(self, dex_id, form=""):
+        return self.by_form.get((dex_id, form))
+
+    def forms(self):
+        # (dex id, form name) of every alternate form sprite, in dex order
+        return sorted((sprite["id"], sprite["form"]) for sprite in self.sprites.values() if sprite["form"])
+
+
+def load_sprite_manifest(sprite_dir=SPRITE_DIR, manifest_path=MANIFEST_FILE, rebuild=True):
+    # The manifest is trusted as long as the sprite directory's mtime is
+    # unchanged (adding, removing or renaming a sprite updates it), so
+    # startup costs one stat() instead of a scan. Returns an empty manifest
+    # when the directory is missing.
+    manifest = load_json_file(manifest_path)
+    try:
+        dir_mtime = os.stat(sprite_dir).st_mtime_ns
+    except FileNotFoundError:
+        print(f"Sprite directory not found: {sprite_dir}")
+        return SpriteManifest({})
+
+    usable = (
+        manifest is not None
+        and manifest.get("version") == MANIFEST_VERSION
+        and manifest.get("sprite_dir") == sprite_dir
+        and manifest.get("dir_mtime") == dir_mtime
+    )
+    if not usable and rebuild:
+        manifest = build_sprite_manifest(sprite_dir, manifest_path, manifest)
+    return SpriteManifest(manifest or {})
+
+
+if __name__ == "__main__":
+    manifest = build_sprite_manifest()
+    print(f"Sprite manifest with {len(manifest['sprites'])} sprites saved to {MANIFEST_FILE}")
@@ -0,0 +1,139 @@
+import re
+
+import numpy as np
+
+from .store import STAT_ALIASES, STAT_NAMES, TYPE_NAMES
+
+TYPE_BITS = {type_name: 1 << i for i, type_name in enumerate(TYPE_NAMES)}
+
+# "bst=400-520", "spe>90", "atk<=100", "hp=80"
+CONDITION = re.compile(r"^(?P<stat>[a-z-]+)\s*(?P<op>>=|<=|>|<|=)\s*(?P<value>\d+)(?:-(?P<high>\d+))?$")
+
+
+def stat_key(name):
+    name = name.lower()
+    return STAT_ALIASES.get(name, name)
+
+
+class StatsTable:
+    # Column store of base stats: one int16 column per stat plus the total,
+    # and a bitmask of each entry's types, so filters over the whole dex are
+    # a handful of vectorized comparisons.
+    def __init__(self, pokedex):
+        # Sprite-only forms have no stats and are left out
+        entries = [entry for entry in pokedex if pokedex.has_data(entry["name"])]
+        self.names = [entry["name"] for entry in entries]
+        self.rows = {name: i for i, name in enumerate(self.names)}
+
+        self.columns = {
+            stat: np.fromiter(
+                (entry.get("stats", {}).get(stat, 0) for entry in entries),
+                dtype=np.int16, count=len(entries),
+            )
+            for stat in STAT_NAMES
+        }
+        self.columns["bst"] = sum(self.columns[stat].astype(np.int32) for stat in STAT_NAMES)
+        self.type_mask = np.fromiter(
+            (sum(TYPE_BITS.get(t, 0) for t in entry.get("types", [])) for entry in entries),
+            dtype=np.uint32, count=len(entries),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def column(self, stat):
+        return self.columns[stat_key(stat)]
+
+    def query(self, types=None, all_types=None, **ranges):
+        # Boolean mask of the entries matching every condition. Ranges are
+        # (low, high) tuples, inclusive, with None for an open bound:
+        #   query(bst=(400, 520), types=["fire", "dragon"], spe=(91, None))
+        # types matches any of the given types, all_types requires all of them.
+        mask = np.ones(len(self.names), dtype=bool)
+        for stat, (low, high) in ranges.items():
+            column = self.column(stat)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        if types:
+            mask &= (self.type_mask & self.bits(types)) != 0
+        if all_types:
+            bits = self.bits(all_types)
+            mask &= (self.type_mask & bits) == bits
+        return mask
+
+    def bits(self, types):
+        return np.uint32(sum(TYPE_BITS.get(t.lower(), 0) for t in types))
+
+    def names_where(self, mask, sort_by=None, descending=True):
+        rows = np.flatnonzero(mask)
+        if sort_by is not None:
+            rows = rows[self.order(self.column(sort_by)[rows], descending)]
+        return [self.names[row] for row in rows]
+
+    def order(self, values, descending):
+        # Stable, so ties keep dex order
+        return np.argsort(-values.astype(np.int32) if descending else values, kind="stable")
+
+    def sort(self, names, sort_by, descending=True):
+        # Reorder any list of names (e.g. the current search results) by a
+        # stat; names without stats in the table keep their order at the end
+        names = list(names)
+        known = [name for name in names if name in self.rows]
+        unknown = [name for name in names if name not in self.rows]
+        rows = np.fromiter((self.rows[name] for name in known), dtype=np.intp, count=len(known))
+        rows = rows[self.order(self.column(sort_by)[rows], descending)]
+        return [self.names[row] for row in rows] + unknown
+
+    def filter(self, names, text):
+        # Keep the names matching a text query, see parse_query; names
+        # without stats in the table can't match and are dropped
+        conditions = parse_query(text)
+        mask = self.query(**conditions)
+        return [name for name in names if name in self.rows and mask[self.rows[name]]]
+
+
+def parse_query(text):
+    # Turn "bst 400-520 fire|dragon spe>90" into keyword arguments for
+    # StatsTable.query
+    conditions = {}
+    tokens = text.lower().split()
+    while tokens:
+        token = tokens.pop(0)
+        if stat_key(token) in STAT_ALIASES.values() and tokens and re.fullmatch(r"\d+-\d+", tokens[0]):
+            # "bst 400-520"
+            token += "=" + tokens.pop(0)
+
+        match = CONDITION.match(token)
+        if match:
+            stat = stat_key(match["stat"])
+            if stat not in STAT_NAMES and stat != "bst":
+                raise ValueError(f"Unknown stat: {match['stat']}")
+            value = int(match["value"])
+            low, high = {
+                ">": (value + 1, None),
+                ">=": (value, None),
+                "<": (None, value - 1),
+                "<=": (None, value),
+                "=": (value, int(match["high"]) if match["high"] else value),
+            }[match["op"]]
+            conditions[stat] = combine(conditions.get(stat), low, high)
+            continue
+
+        types = token.removeprefix("types=").split("|")
+        if all(t in TYPE_BITS for t in types):
+            conditions.setdefault("types", []).extend(types)
+        else:
+            raise ValueError(f"Can't understand filter: {token}")
+    return conditions
+
+
+def combine(previous, low, high):
+    # Intersect two ranges on the same stat
+    if previous is None:
+        return (low, high)
+    old_low, old_high = previous
+    low = old_low if low is None else low if old_low is None else max(low, old_low)
+    high = old_high if high is None else high if old_high is None else min(high, old_high)
+    return (low, high)
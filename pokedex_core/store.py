@@ -0,0 +1,190 @@
+from collections import defaultdict
+import json
+
+from . import instrument
+from .dataset import open_dataset
+from .evolution import EvolutionGraph, chain_sort_key
+
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+# Short names accepted by stat queries and sorts, "bst" is the total (kept
+# here rather than in pokedex_core.stats so the CLI can list them without
+# importing NumPy)
+STAT_ALIASES = {
+    "hp": "hp",
+    "atk": "attack",
+    "def": "defense",
+    "spa": "special-attack",
+    "spd": "special-defense",
+    "spe": "speed",
+    "bst": "bst",
+}
+
+TYPE_NAMES = (
+    "normal", "fire", "water", "electric", "grass", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy",
+)
+
+
+def load_json_data(filename, default=None):
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print(f"File not found: {filename}")
+    except Exception as e:
+        print(f"Error reading file {filename}: {e}")
+    return default
+
+
+class PokedexStore:
+    # In-memory Pokédex built once from pokemon_data_sorted.json (and
+    # evolution_chains.json), indexed so that every lookup the picker does is
+    # a dict hit instead of a scan over the whole list.
+    def __init__(self, pokemon_data, evolution_chains=None):
+        self.entries = []
+        self.by_name = {}
+        self.by_id = {}
+        self.by_form = {}  # (dex id, form name) -> entry, "" being the default form
+        self.by_type = defaultdict(list)
+        self.by_ability = defaultdict(list)
+        self.evolution = EvolutionGraph()
+        # Names that don't evolve any further (shared with the graph)
+        self.final_forms = self.evolution.finals
+
+        for position, record in enumerate(pokemon_data):
+            # The sorted data file is in national dex order, so the position
+            # doubles as the dex number when the record doesn't carry one
+            entry = dict(record)
+            entry["name"] = record["name"].lower()
+            entry.setdefault("id", position + 1)
+            entry.setdefault("form", "")
+            self.add(entry)
+
+        if evolution_chains:
+            self.index_evolution_chains(evolution_chains)
+
+    @classmethod
+    @instrument.timed("core.load_store")
+    def load(cls, data_dir="data"):
+        # Prefer the compiled dataset when it is up to date
+        dataset = open_dataset(data_dir)
+        if dataset is not None:
+            return cls.from_dataset(dataset)
+        pokemon_data = load_json_data(f"{data_dir}/pokemon_data_sorted.json", [])
+        evolution_chains = load_json_data(f"{data_dir}/evolution_chains.json", {})
+        return cls(pokemon_data, evolution_chains)
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        return cls(dataset.pokemon_records(), dataset.evolution_chains())
+
+    def add(self, entry):
+        name = entry["name"]
+        self.entries.append(entry)
+        self.by_name[name] = entry
+        self.by_id.setdefault(entry["id"], entry)
+        self.by_form[(entry["id"], entry["form"])] = entry
+        for type_name in entry.get("types", []):
+            self.by_type[type_name].append(name)
+        for ability in entry.get("normal_abilities", []) + entry.get("hidden_abilities", []):
+            self.by_ability[ability].append(name)
+
+    def add_forms(self, forms):
+        # Alternate forms that only exist as sprites ("201-a", "6-mega-x"),
+        # given as (dex id, form name) pairs, become entries of their own
+        # placed right after their species. Their names come from the sprite
+        # key: the species name without its default form ("deoxys" for
+        # "deoxys-normal", whose sprite is "386-normal") plus the form. They
+        # have no types, stats or abilities of their own, so the engines
+        # built on those leave them out; only the species they belong to is
+        # recorded. Sprites of the default form itself, and forms the data
+        # files already have (fetched as ids 10001+), aren't added.
+        species_count = len(self.entries)
+        forms_by_id = defaultdict(list)
+        for dex_id, form in forms:
+            forms_by_id[dex_id].append(form)
+
+        forms_of = defaultdict(list)
+        for dex_id, sprite_forms in forms_by_id.items():
+            base = self.by_form.get((dex_id, ""))
+            if base is None:
+                continue
+            root = base["name"]
+            for form in sprite_forms:
+                if root.endswith(f"-{form}"):
+                    root = root[:-len(form) - 1]
+                    break
+            for form in sprite_forms:
+                name = f"{root}-{form}"
+                if name == base["name"] or name in self.by_name or (dex_id, form) in self.by_form:
+                    continue
+                entry = {"id": dex_id, "name": name, "form": form, "species": base["name"]}
+                self.add(entry)
+                self.evolution.add_form(name, base["name"])
+                forms_of[base["name"]].append(entry)
+
+        if forms_of:
+            entries = []
+            for entry in self.entries[:species_count]:
+                entries.append(entry)
+                entries.extend(forms_of.get(entry["name"], ()))
+            self.entries = entries
+        return [entry for added in forms_of.values() for entry in added]
+
+    def index_evolution_chains(self, evolution_chains):
+        # Chains are added in chain id order so the graph doesn't depend on
+        # the order the file was written in
+        for chain_id in sorted(evolution_chains, key=chain_sort_key):
+            for details in evolution_chains[chain_id].values():
+                self.add_evolution_chain(
+                    chain_id, details["full_chain"], details["final_forms"], details.get("edges")
+                )
+
+    def add_evolution_chain(self, chain_id, full_chain, final_forms=(), edges=None):
+        # Without edges (files from older fetches) they are reconstructed
+        # from the chain order, see evolution.edges_from_preorder
+        self.evolution.add_chain(chain_id, full_chain, edges, final_forms)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __contains__(self, name):
+        return name.lower() in self.by_name
+
+    def get(self, name):
+        return self.by_name.get(name.lower())
+
+    def get_by_id(self, dex_id, form=""):
+        return self.by_form.get((dex_id, form))
+
+    def names(self):
+        return [entry["name"] for entry in self.entries]
+
+    def has_data(self, name):
+        # False for the sprite-only forms added by add_forms
+        entry = self.get(name)
+        return entry is not None and "species" not in entry
+
+    def with_type(self, type_name):
+        return self.by_type.get(type_name, [])
+
+    def with_ability(self, ability):
+        return self.by_ability.get(ability, [])
+
+    def chain_members(self, name):
+        return self.evolution.chain_members(name.lower())
+
+    def stage(self, name):
+        return self.evolution.stage(name.lower())
+
+    def sprite_key(self, name):
+        # File stem of the entry's sprite in data/images/pokemons
+        entry = self.get(name)
+        if entry is None:
+            return None
+        return f"{entry['id']}-{entry['form']}" if entry["form"] else str(entry["id"])
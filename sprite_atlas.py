@@ -0,0 +1,132 @@
+from PIL import Image
+import json
+import os
+import tempfile
+
+from pokedex_core.json_io import replace_file, write_json_atomic
+
+SPRITE_DIR = "data/images/pokemons"
+ATLAS_IMAGE = "data/images/sprite_atlas.png"
+ATLAS_INDEX = "data/images/sprite_atlas.json"
+
+CELL_SIZE = 96
+ATLAS_COLUMNS = 40
+ATLAS_VERSION = 1
+
+
+def scan_sprite_sources(sprite_dir=SPRITE_DIR):
+    # Map each sprite key ("25", "15-mega", "201-a", ...) to the mtime and
+    # size of its file, which is what the atlas is invalidated against
+    sources = {}
+    if not os.path.isdir(sprite_dir):
+        return sources
+    with os.scandir(sprite_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".png") and entry.is_file():
+                stat = entry.stat()
+                sources[entry.name[:-4]] = [stat.st_mtime_ns, stat.st_size]
+    return sources
+
+
+def sprite_sort_key(key):
+    # Dex number first, then the form suffix, so the atlas follows dex order
+    number, _, form = key.partition("-")
+    return (int(number), form) if number.isdigit() else (float("inf"), key)
+
+
+def build_sprite_atlas(sprite_dir=SPRITE_DIR, atlas_image=ATLAS_IMAGE, atlas_index=ATLAS_INDEX):
+    sources = scan_sprite_sources(sprite_dir)
+    keys = sorted(sources, key=sprite_sort_key)
+    rows = (len(keys) - 1) // ATLAS_COLUMNS + 1 if keys else 1
+
+    atlas = Image.new("RGBA", (ATLAS_COLUMNS * CELL_SIZE, rows * CELL_SIZE), (255, 255, 255, 0))
+    sprites = {}
+    for slot, key in enumerate(keys):
+        try:
+            img = Image.open(os.path.join(sprite_dir, f"{key}.png")).convert("RGBA")
+            img = img.resize((CELL_SIZE, CELL_SIZE), Image.LANCZOS)
+        except Exception as e:
+            print(f"Skipping sprite {key}: {e}")
+            continue
+        row, col = divmod(slot, ATLAS_COLUMNS)
+        atlas.paste(img, (col * CELL_SIZE, row * CELL_SIZE))
+        sprites[key] = slot
+
+    # Both files are written to temporary files and renamed into place. The
+    # old index goes first and the new one is written last, so an
+    # interrupted build never leaves an index describing a different or
+    # truncated atlas; the next start just rebuilds.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(atlas_image) or ".", prefix=".tmp-", suffix=".png")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            atlas.save(file, format="PNG", optimize=False)
+        if os.path.exists(atlas_index):
+            os.remove(atlas_index)
+        replace_file(tmp_path, atlas_image)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    index = {
+        "version": ATLAS_VERSION,
+        "cell_size": CELL_SIZE,
+        "columns": ATLAS_COLUMNS,
+        "sources": sources,
+        "sprites": sprites,
+    }
+    write_json_atomic(atlas_index, index)
+
+    print(f"Built sprite atlas with {len(sprites)} sprites: {atlas_image}")
+    return index
+
+
+def atlas_is_stale(index, sprite_dir=SPRITE_DIR):
+    if index.get("version") != ATLAS_VERSION or index.get("cell_size") != CELL_SIZE:
+        return True
+    return index.get("sources") != scan_sprite_sources(sprite_dir)
+
+
+class SpriteAtlas:
+    def __init__(self, image, index):
+        self.image = image
+        self.cell_size = index["cell_size"]
+        self.columns = index["columns"]
+        self.sprites = index["sprites"]
+
+    def __contains__(self, key):
+        return key in self.sprites
+
+    def get(self, key):
+        # Slice a single pre-resized sprite out of the atlas
+        slot = self.sprites.get(key)
+        if slot is None:
+            return None
+        row, col = divmod(slot, self.columns)
+        x, y = col * self.cell_size, row * self.cell_size
+        return self.image.crop((x, y, x + self.cell_size, y + self.cell_size))
+
+
+def load_sprite_atlas(sprite_dir=SPRITE_DIR, atlas_image=ATLAS_IMAGE, atlas_index=ATLAS_INDEX, rebuild=True):
+    # Load the atlas, rebuilding it first if any source sprite changed.
+    # Returns None when there is no usable atlas and rebuilding is disabled.
+    try:
+        with open(atlas_index, "r") as file:
+            index = json.load(file)
+    except (FileNotFoundError, ValueError):
+        index = None
+
+    if index is None or atlas_is_stale(index, sprite_dir) or not os.path.exists(atlas_image):
+        if not rebuild:
+            return None
+        try:
+            index = build_sprite_atlas(sprite_dir, atlas_image, atlas_index)
+        except Exception as e:
+            print(f"Error building sprite atlas: {e}")
+            return None
+
+    image = Image.open(atlas_image)
+    image.load()
+    return SpriteAtlas(image, index)
+
+
+if __name__ == "__main__":
+    build_sprite_atlas()
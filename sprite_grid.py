@@ -0,0 +1,183 @@
+import tkinter as tk
+
+# Pixels the pointer has to travel with the button down for a click to
+# become a drag
+DRAG_THRESHOLD = 8
+
+
+class VirtualSpriteGrid:
+    # A canvas backed grid that only keeps labels for the rows currently in
+    # view (plus some overscan). Labels that scroll out of view are hidden and
+    # recycled for the rows that scroll in, so the number of live widgets
+    # depends on the window size and not on the number of entries.
+    def __init__(self, canvas, render, on_click, on_hover, style=None, on_refresh=None,
+                 on_move=None, columns=10, cell_width=120, cell_height=130, overscan=2):
+        self.canvas = canvas
+        self.render = render
+        # Cheaper callback used when only the label's styling has to change
+        self.style = style or render
+        self.on_click = on_click
+        self.on_hover = on_hover
+        # Called after every refresh, i.e. whenever the rows in view may
+        # have changed
+        self.on_refresh = on_refresh
+        # on_move(entry, old position, new position) is called when a label
+        # is dragged onto another cell; without it drags are ignored
+        self.on_move = on_move
+        self.columns = columns
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.overscan = overscan
+
+        self.entries = []
+        self.visible = {}  # grid position -> label currently showing it
+        self.free_labels = []
+        self.drag = None
+
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+
+    def set_entries(self, entries):
+        # Swap the displayed entries, re-rendering only the visible positions
+        # whose entry actually changed
+        old_entries = self.entries
+        self.entries = list(entries)
+
+        for position, label in list(self.visible.items()):
+            if position >= len(self.entries):
+                self.release(position)
+            elif position >= len(old_entries) or old_entries[position] != self.entries[position]:
+                label.entry = self.entries[position]
+                self.render(label, label.entry)
+
+        self.update_scrollregion()
+        self.refresh()
+
+    def update_scrollregion(self):
+        rows = (len(self.entries) - 1) // self.columns + 1 if self.entries else 0
+        self.canvas.config(
+            scrollregion=(0, 0, self.columns * self.cell_width, rows * self.cell_height)
+        )
+
+    def visible_positions(self):
+        if not self.entries:
+            return range(0)
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.cell_height)
+        first_row = max(0, int(top // self.cell_height) - self.overscan)
+        last_row = int((top + height) // self.cell_height) + self.overscan
+        first = first_row * self.columns
+        last = min(len(self.entries), (last_row + 1) * self.columns)
+        return range(first, last)
+
+    def refresh(self):
+        wanted = self.visible_positions()
+
+        for position in list(self.visible):
+            if position not in wanted:
+                self.release(position)
+
+        for position in wanted:
+            if position not in self.visible:
+                self.acquire(position)
+
+        if self.on_refresh is not None:
+            self.on_refresh()
+
+    def acquire(self, position):
+        if self.free_labels:
+            label = self.free_labels.pop()
+        else:
+            label = self.create_label()
+
+        row, col = divmod(position, self.columns)
+        self.canvas.coords(label.window_item, col * self.cell_width, row * self.cell_height)
+        self.canvas.itemconfigure(label.window_item, state="normal")
+
+        label.entry = self.entries[position]
+        label.position = position
+        self.render(label, label.entry)
+        self.visible[position] = label
+
+    def release(self, position):
+        label = self.visible.pop(position)
+        self.canvas.itemconfigure(label.window_item, state="hidden")
+        label.entry = None
+        self.free_labels.append(label)
+
+    def create_label(self):
+        label = tk.Label(self.canvas, compound="top", bd=0)
+        label.entry = None
+        label.window_item = self.canvas.create_window(
+            0, 0, window=label, anchor="nw", width=self.cell_width - 10,
+            height=self.cell_height - 10
+        )
+        label.position = None
+        # A click picks the label on release, so pressing and dragging it
+        # can move it instead
+        label.bind("<ButtonPress-1>", lambda event, label=label: self.press(label, event))
+        label.bind("<ButtonRelease-1>", lambda event, label=label: self.release_button(label, event))
+        label.bind("<Enter>", lambda event, label=label: self.on_hover(label.entry))
+        return label
+
+    def press(self, label, event):
+        self.drag = (label.entry, event.x_root, event.y_root)
+
+    def release_button(self, label, event):
+        drag, self.drag = self.drag, None
+        if drag is None or drag[0] != label.entry:
+            return
+        if abs(event.x_root - drag[1]) + abs(event.y_root - drag[2]) < DRAG_THRESHOLD:
+            self.on_click(label.entry, label)
+            return
+        if self.on_move is None:
+            return
+        target = self.position_at(event.x_root, event.y_root)
+        if target is not None and target != label.position:
+            self.on_move(label.entry, label.position, target)
+
+    def position_at(self, x_root, y_root):
+        # Grid position under a screen point, clamped to the last entry
+        if not self.entries:
+            return None
+        x = x_root - self.canvas.winfo_rootx()
+        y = self.canvas.canvasy(y_root - self.canvas.winfo_rooty())
+        col = min(max(0, int(x // self.cell_width)), self.columns - 1)
+        row = max(0, int(y // self.cell_height))
+        return min(row * self.columns + col, len(self.entries) - 1)
+
+    def move_entry(self, old, new):
+        # Move the entry at old to new; only the positions in between shift,
+        # so only their on-screen labels are re-rendered
+        self.entries.insert(new, self.entries.pop(old))
+        self.redraw(min(old, new), max(old, new) + 1)
+
+    def redraw(self, start=0, stop=None):
+        # Re-render the on-screen labels of positions start to stop
+        for position, label in self.visible.items():
+            if start <= position and (stop is None or position < stop):
+                label.entry = self.entries[position]
+                self.render(label, label.entry)
+
+    def restyle(self, entries=None):
+        # Restyle the on-screen labels showing one of the given entries (all
+        # of them when entries is None); off-screen entries pick up their
+        # style when they are rendered
+        for label in self.visible.values():
+            if entries is None or label.entry in entries:
+                self.style(label, label.entry)
+
+    def labels(self):
+        return list(self.visible.values())
+
+    def yview(self, *args):
+        # Scrollbar command: scroll the canvas then populate the new rows
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def scroll(self, units):
+        self.canvas.yview_scroll(units, "units")
+        self.refresh()
+
+    def scroll_to_top(self):
+        self.canvas.yview_moveto(0)
+        self.refresh()
@@ -0,0 +1,151 @@
+from collections import deque
+import queue
+import threading
+
+from PIL import Image, ImageTk
+
+from pokedex_core import instrument
+from sprite_atlas import ATLAS_IMAGE, ATLAS_INDEX, CELL_SIZE, SPRITE_DIR, load_sprite_atlas
+
+# Decoding threads; PIL releases the GIL while it decodes and resizes, so
+# these run in parallel with each other and with the Tk main loop
+SPRITE_WORKERS = 4
+
+# How often the Tk thread collects finished sprites while work is pending,
+# and how many it turns into PhotoImages per tick so a burst of finished
+# sprites never stalls a frame
+POLL_MS = 15
+MAX_PER_TICK = 24
+
+
+class SpriteLoader:
+    # Decodes sprites on background threads and hands them to the Tk thread.
+    #
+    # request(now, later) replaces the work queue: "now" keys (the rows in
+    # view) are decoded first, "later" keys (rows just outside the view,
+    # the top search results) after them, and anything queued earlier that
+    # is in neither list is dropped, so fast scrolling doesn't leave a
+    # backlog of sprites nobody is looking at. Workers only produce PIL
+    # images; PhotoImages are created on the Tk thread, which polls for
+    # results with after() and calls on_loaded(key, photo) for each of them
+    # (photo is None when the sprite couldn't be decoded).
+    #
+    # The sprite atlas is loaded (and rebuilt when stale) on a thread too;
+    # until it is ready, sprites are decoded from their individual files.
+    def __init__(self, root, on_loaded, sprite_dir=SPRITE_DIR, atlas_image=ATLAS_IMAGE,
+                 atlas_index=ATLAS_INDEX, workers=SPRITE_WORKERS, use_atlas=True):
+        self.root = root
+        self.on_loaded = on_loaded
+        self.sprite_dir = sprite_dir
+        self.atlas_image = atlas_image
+        self.atlas_index = atlas_index
+        self.atlas = None
+
+        self.now = deque()
+        self.later = deque()
+        self.wanted = set()  # keys in either queue
+        self.in_flight = set()  # keys being decoded or waiting to be collected
+        self.results = queue.Queue()
+        self.condition = threading.Condition()
+        self.polling = False
+        self.closed = False
+
+        self.threads = [threading.Thread(target=self.work, daemon=True) for _ in range(workers)]
+        if use_atlas:
+            self.threads.append(threading.Thread(target=self.load_atlas, daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    @instrument.timed("sprites.load_atlas")
+    def load_atlas(self):
+        try:
+            self.atlas = load_sprite_atlas(self.sprite_dir, self.atlas_image, self.atlas_index)
+        except Exception as e:
+            print(f"Error loading sprite atlas: {e}")
+
+    def request(self, now, later=()):
+        with self.condition:
+            self.now = deque(key for key in dict.fromkeys(now) if key not in self.in_flight)
+            wanted_now = set(self.now)
+            self.later = deque(
+                key for key in dict.fromkeys(later)
+                if key not in self.in_flight and key not in wanted_now
+            )
+            self.wanted = wanted_now.union(self.later)
+            pending = bool(self.wanted)
+            if pending:
+                self.condition.notify_all()
+        if pending:
+            self.start_polling()
+
+    def next_key(self):
+        # Called with the condition held; None once the loader is closed
+        while not self.closed:
+            for pending in (self.now, self.later):
+                while pending:
+                    key = pending.popleft()
+                    if key in self.wanted:
+                        self.wanted.discard(key)
+                        self.in_flight.add(key)
+                        return key
+            self.condition.wait()
+        return None
+
+    def work(self):
+        while True:
+            with self.condition:
+                key = self.next_key()
+            if key is None:
+                return
+            try:
+                image = self.decode(key)
+            except Exception as e:
+                print(f"Error decoding sprite {key}: {e}")
+                image = None
+            self.results.put((key, image))
+
+    @instrument.timed("sprites.decode")
+    def decode(self, key):
+        # Slice the sprite out of the atlas, falling back to the individual
+        # file if the atlas isn't loaded yet or doesn't have it
+        atlas = self.atlas
+        image = atlas.get(key) if atlas is not None else None
+        if image is None:
+            try:
+                image = Image.open(f"{self.sprite_dir}/{key}.png")
+            except FileNotFoundError:
+                instrument.count("sprites.missing")
+                return None
+            instrument.count("sprites.decoded_from_file")
+            image = image.resize((CELL_SIZE, CELL_SIZE), Image.LANCZOS)
+        image.load()
+        return image
+
+    def start_polling(self):
+        if not self.polling and not self.closed:
+            self.polling = True
+            self.root.after(POLL_MS, self.poll)
+
+    def poll(self):
+        # Runs on the Tk thread
+        self.polling = False
+        for _ in range(MAX_PER_TICK):
+            try:
+                key, image = self.results.get_nowait()
+            except queue.Empty:
+                break
+            with self.condition:
+                self.in_flight.discard(key)
+            with instrument.timer("sprites.photo_image"):
+                photo = ImageTk.PhotoImage(image) if image is not None else None
+            self.on_loaded(key, photo)
+
+        with self.condition:
+            busy = bool(self.in_flight or self.wanted)
+        if busy or not self.results.empty():
+            self.start_polling()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -0,0 +1,201 @@
+import argparse
+import hashlib
+import http.server
+import json
+import threading
+import urllib.parse
+
+# A local stand-in for PokéAPI serving fixture JSON, so the fetch scripts can
+# be run against it with POKEAPI_BASE_URL. It paginates the list endpoints
+# (count / next / results, at most page_size entries per page whatever
+# limit is asked for), answers If-None-Match with 304 Not Modified, and can
+# be told to fail a path a number of times before serving it:
+#
+#   python tests/fixture_server.py --port 8765
+#   POKEAPI_BASE_URL=http://127.0.0.1:8765/api/v2 python fetch_mons_details.py
+
+API_PREFIX = "/api/v2/"
+
+
+def named(name, url=None):
+    return {"name": name, "url": url or ""}
+
+
+def pokemon(pokemon_id, name, types, abilities, stats):
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "types": [{"slot": i + 1, "type": named(type_name)} for i, type_name in enumerate(types)],
+        "abilities": [
+            {"ability": named(ability), "is_hidden": hidden, "slot": i + 1}
+            for i, (ability, hidden) in enumerate(abilities)
+        ],
+        "stats": [
+            {"base_stat": value, "effort": 0, "stat": named(stat)}
+            for stat, value in zip(("hp", "attack", "defense", "special-attack", "special-defense", "speed"), stats)
+        ],
+    }
+
+
+def chain_link(species, *evolves_to):
+    return {"species": named(species), "evolves_to": list(evolves_to), "is_baby": False}
+
+
+def ability(name, texts):
+    return {
+        "name": name,
+        "flavor_text_entries": [
+            {"flavor_text": text, "language": named(language), "version_group": named("sword-shield")}
+            for language, text in texts.items()
+        ],
+    }
+
+
+def default_fixtures():
+    # path (below /api/v2/) -> JSON body; list endpoints are built from the
+    # resources under them
+    fixtures = {}
+    for pokemon_id, name, types, abilities, stats in (
+        (1, "bulbasaur", ["grass", "poison"], [("overgrow", False), ("chlorophyll", True)], (45, 49, 49, 65, 65, 45)),
+        (2, "ivysaur", ["grass", "poison"], [("overgrow", False), ("chlorophyll", True)], (60, 62, 63, 80, 80, 60)),
+        (133, "eevee", ["normal"], [("run-away", False), ("adaptability", False)], (55, 55, 50, 45, 65, 55)),
+        (134, "vaporeon", ["water"], [("water-absorb", False)], (130, 65, 60, 110, 95, 65)),
+        (135, "jolteon", ["electric"], [("volt-absorb", False)], (65, 65, 60, 110, 95, 130)),
+        (10033, "venusaur-mega", ["grass", "poison"], [("thick-fat", False)], (80, 100, 123, 122, 120, 80)),
+    ):
+        fixtures[f"pokemon/{pokemon_id}"] = pokemon(pokemon_id, name, types, abilities, stats)
+
+    fixtures["evolution-chain/1"] = {"id": 1, "chain": chain_link("bulbasaur", chain_link("ivysaur"))}
+    fixtures["evolution-chain/67"] = {
+        "id": 67,
+        "chain": chain_link("eevee", chain_link("vaporeon"), chain_link("jolteon")),
+    }
+
+    fixtures["ability/overgrow"] = ability("overgrow", {"en": "Powers up Grass-type moves.", "fr": "Boost Plante."})
+    fixtures["ability/chlorophyll"] = ability("chlorophyll", {"en": "Boosts Speed in sunshine."})
+    fixtures["ability/run-away"] = ability("run-away", {"en": "Enables a sure getaway.", "de": "Flucht."})
+    return fixtures
+
+
+class FixtureServer:
+    # Runs in a background thread; base_url is the POKEAPI_BASE_URL to use
+    def __init__(self, fixtures=None, page_size=2, host="127.0.0.1", port=0):
+        self.fixtures = default_fixtures() if fixtures is None else fixtures
+        self.page_size = page_size
+        self.failures = {}  # path -> (status, remaining count, -1 for always)
+        self.requests = []  # (path with query, status) of every request
+        self.lock = threading.Lock()
+        self.httpd = http.server.ThreadingHTTPServer((host, port), self.handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX.rstrip('/')}"
+
+    def fail(self, path, status=503, times=1):
+        # Answer the next times requests for path (e.g. "pokemon/2", or
+        # "pokemon?offset=2&limit=2" for one listing page) with status;
+        # times=-1 fails for good
+        self.failures[path.strip("/")] = (status, times)
+
+    def statuses(self, path):
+        # Statuses returned for path, in order
+        return [status for requested, status in self.requests if requested.split("?")[0].strip("/") == path.strip("/")]
+
+    def listing(self, endpoint, query):
+        prefix = endpoint + "/"
+        resources = sorted(
+            (path[len(prefix):] for path in self.fixtures if path.startswith(prefix)),
+            key=lambda key: (0, int(key)) if key.isdigit() else (1, key),
+        )
+        offset = int(query.get("offset", ["0"])[0])
+        limit = min(int(query.get("limit", ["20"])[0]), self.page_size)
+        page = resources[offset:offset + limit]
+        next_url = None
+        if offset + limit < len(resources):
+            next_url = f"{self.base_url}/{endpoint}/?offset={offset + limit}&limit={limit}"
+        results = []
+        for key in page:
+            body = self.fixtures[prefix + key]
+            results.append({"name": body.get("name", key), "url": f"{self.base_url}/{endpoint}/{key}/"})
+        return {"count": len(resources), "next": next_url, "previous": None, "results": results}
+
+    def respond(self, request_path):
+        # (status, headers, body) for a GET of request_path
+        url = urllib.parse.urlsplit(request_path)
+        if not url.path.startswith(API_PREFIX):
+            return 404, {}, None
+        path = url.path[len(API_PREFIX):].strip("/")
+
+        with self.lock:
+            for key in (f"{path}?{url.query}", path):
+                status, times = self.failures.get(key, (None, 0))
+                if times:
+                    self.failures[key] = (status, times - 1 if times > 0 else times)
+                    return status, {"Retry-After": "0"}, None
+
+        if path in self.fixtures:
+            return 200, {}, self.fixtures[path]
+        if "/" not in path and any(key.startswith(path + "/") for key in self.fixtures):
+            return 200, {}, self.listing(path, urllib.parse.parse_qs(url.query))
+        return 404, {}, None
+
+    def handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, headers, body = server.respond(self.path)
+                data = b""
+                if body is not None:
+                    data = json.dumps(body, sort_keys=True).encode("utf-8")
+                    headers["ETag"] = '"%s"' % hashlib.sha1(data).hexdigest()
+                    headers["Content-Type"] = "application/json"
+                    if self.headers.get("If-None-Match") == headers["ETag"]:
+                        status, data = 304, b""
+                with server.lock:
+                    server.requests.append((self.path[len(API_PREFIX) - 1:].lstrip("/"), status))
+
+                self.send_response(status)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the fixture JSON as a local stand-in for PokéAPI")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--page-size", type=int, default=2, help="entries per page of the list endpoints")
+    args = parser.parse_args()
+    server = FixtureServer(page_size=args.page_size, port=args.port)
+    print(f"Serving fixtures at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
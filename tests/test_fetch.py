@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from fixture_server import FixtureServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The fetch scripts run as they would from a checkout, in a scratch working
+# directory, against the fixture server. The server pages its listings two
+# entries at a time, so every listing spans several pages.
+
+
+class FetchScriptTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer(page_size=2).start()
+        self.addCleanup(self.server.stop)
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+
+    def run_script(self, script, **env):
+        # Only the requests of this run are kept in server.requests
+        self.server.requests.clear()
+        environ = dict(
+            os.environ,
+            POKEAPI_BASE_URL=self.server.base_url,
+            POKEAPI_CACHE_DIR=os.path.join(self.work_dir, "data", ".http_cache"),
+            POKEAPI_RATE_LIMIT="0",
+            POKEAPI_CONCURRENCY="4",
+            **env
+        )
+        return subprocess.run(
+            [sys.executable, os.path.join(REPO_DIR, script)],
+            cwd=self.work_dir, env=environ, capture_output=True, text=True, timeout=60,
+        )
+
+    def data_path(self, *parts):
+        return os.path.join(self.work_dir, "data", *parts)
+
+    def load(self, *parts):
+        with open(self.data_path(*parts), "r") as file:
+            return json.load(file)
+
+    def test_pokemon_details_retry_and_pagination(self):
+        self.server.fail("pokemon/2", status=503, times=2)
+        result = self.run_script("fetch_mons_details.py")
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+        # 6 entries, two per page
+        self.assertEqual(self.server.statuses("pokemon"), [200, 200, 200])
+        self.assertEqual(self.server.statuses("pokemon/2"), [503, 503, 200])
+
+        pokemon = self.load("pokemon_data_sorted.json")
+        self.assertEqual([entry["id"] for entry in pokemon], [1, 2, 133, 134, 135, 10033])
+        self.assertEqual(pokemon[1], {
+            "id": 2,
+            "name": "ivysaur",
+            "types": ["grass", "poison"],
+            "normal_abilities": ["overgrow"],
+            "hidden_abilities": ["chlorophyll"],
+            "stats": {
+                "hp": 60, "attack": 62, "defense": 63,
+                "special-attack": 80, "special-defense": 80, "speed": 60,
+            },
+        })
+        self.assertFalse(os.path.exists(self.data_path(".checkpoints", "pokemon_data.ndjson")))
+
+    def test_cache_revalidation(self):
+        self.assertEqual(self.run_script("fetch_mons_details.py").returncode, 0)
+        first = self.load("pokemon_data_sorted.json")
+
+        # Fresh cache entries are reused without a request
+        result = self.run_script("fetch_mons_details.py")
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self.server.requests, [])
+
+        # Stale ones are revalidated, and nothing changed on the server
+        result = self.run_script("fetch_mons_details.py", POKEAPI_CACHE_MAX_AGE="0")
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(len(self.server.requests), 3 + len(first))
+        self.assertEqual({status for _, status in self.server.requests}, {304})
+        self.assertEqual(self.load("pokemon_data_sorted.json"), first)
+
+        # A changed resource is downloaded again
+        self.server.fixtures["pokemon/133"]["name"] = "eevee-changed"
+        result = self.run_script("fetch_mons_details.py", POKEAPI_CACHE_MAX_AGE="0")
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self.server.statuses("pokemon/133"), [200])
+        names = [entry["name"] for entry in self.load("pokemon_data_sorted.json")]
+        self.assertIn("eevee-changed", names)
+
+    def test_failed_listing_page_keeps_existing_data(self):
+        self.assertEqual(self.run_script("fetch_mons_details.py").returncode, 0)
+        with open(self.data_path("pokemon_data_sorted.json"), "rb") as file:
+            before = file.read()
+
+        # The second page keeps failing past every retry
+        self.server.fail("pokemon?offset=2&limit=2", status=503, times=-1)
+        result = self.run_script("fetch_mons_details.py", POKEAPI_CACHE_MAX_AGE="0", POKEAPI_MAX_RETRIES="2")
+        self.assertEqual(result.returncode, 1, result.stdout + result.stderr)
+        self.assertIn("left unchanged", result.stdout)
+        self.assertEqual(self.server.statuses("pokemon"), [304, 503, 503, 503])
+        with open(self.data_path("pokemon_data_sorted.json"), "rb") as file:
+            self.assertEqual(file.read(), before)
+
+    def test_failed_pokemon_keeps_existing_data(self):
+        self.assertEqual(self.run_script("fetch_mons_details.py").returncode, 0)
+        with open(self.data_path("pokemon_data_sorted.json"), "rb") as file:
+            before = file.read()
+
+        self.server.fail("pokemon/134", status=503, times=-1)
+        result = self.run_script("fetch_mons_details.py", POKEAPI_CACHE_MAX_AGE="0", POKEAPI_MAX_RETRIES="1")
+        self.assertEqual(result.returncode, 1, result.stdout + result.stderr)
+        self.assertIn("left unchanged", result.stdout)
+        with open(self.data_path("pokemon_data_sorted.json"), "rb") as file:
+            self.assertEqual(file.read(), before)
+        self.assertTrue(os.path.exists(self.data_path(".checkpoints", "pokemon_data.ndjson")))
+
+    def test_failed_chain_keeps_checkpoint(self):
+        # Chains from an earlier refresh, kept until every chain is fetched
+        os.makedirs(self.data_path())
+        with open(self.data_path("evolution_chains.json"), "w") as file:
+            json.dump({"1": {}, "67": {}}, file)
+
+        self.server.fail("evolution-chain/67", status=500, times=-1)
+        result = self.run_script("fetch_families.py", POKEAPI_MAX_RETRIES="1")
+        self.assertEqual(result.returncode, 1, result.stdout + result.stderr)
+        self.assertTrue(os.path.exists(self.data_path(".checkpoints", "evolution_chains.ndjson")))
+        self.assertEqual(self.load("evolution_chains.json"), {"1": {}, "67": {}})
+
+        # The next run only asks for the chain that failed
+        self.server.failures.clear()
+        result = self.run_script("fetch_families.py")
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self.server.statuses("evolution-chain/1"), [])
+        self.assertEqual(self.server.statuses("evolution-chain/67"), [200])
+        # Keyed by chain id, each chain by its first species
+        self.assertEqual(self.load("evolution_chains.json"), {
+            "1": {"bulbasaur": {
+                "final_forms": ["ivysaur"],
+                "full_chain": ["bulbasaur", "ivysaur"],
+                "edges": [["bulbasaur", "ivysaur"]],
+            }},
+            "67": {"eevee": {
+                "final_forms": ["vaporeon", "jolteon"],
+                "full_chain": ["eevee", "vaporeon", "jolteon"],
+                "edges": [["eevee", "vaporeon"], ["eevee", "jolteon"]],
+            }},
+        })
+        self.assertFalse(os.path.exists(self.data_path(".checkpoints", "evolution_chains.ndjson")))
+
+    def test_abilities(self):
+        result = self.run_script("fetch_abilities.py")
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self.server.statuses("ability"), [200, 200])
+
+        abilities = self.load("abilities_flavor_text.json")
+        self.assertEqual(list(abilities), ["chlorophyll", "overgrow", "run-away"])
+        self.assertEqual(abilities["overgrow"]["fr"], "Boost Plante.")
+        self.assertEqual(self.load("abilities", "index.json"), {"languages": ["de", "en", "fr"]})
+        self.assertEqual(self.load("abilities", "de.json"), {"run-away": "Flucht."})
+
+
+if __name__ == "__main__":
+    unittest.main()
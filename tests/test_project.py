@@ -0,0 +1,181 @@
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pokedex_core.order import RegionalOrder
+from pokedex_core.project import JOURNAL_SUFFIX, Project
+
+
+def read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def state(project):
+    # Everything a reopened project must agree on
+    return {
+        "active": project.active,
+        "dexes": {name: dex.to_json() for name, dex in project.dexes.items()},
+    }
+
+
+class ProjectJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+        self.path = os.path.join(self.work_dir, "test.pdex")
+        self.journal_path = self.path + JOURNAL_SUFFIX
+
+    def open(self, **options):
+        project = Project(self.path, **options)
+        self.addCleanup(project.close)
+        return project
+
+    def make_project(self):
+        project = Project(self.path)
+        project.active_dex().entries.update(["bulbasaur", "ivysaur", "venusaur", "charmander"])
+        project.move("charmander", 0)
+        project.set_note("ivysaur", "trade evolution? no")
+        project.create_dex("Old")
+        project.rename_dex("Old", "Johto")
+        project.dexes["Johto"].entries.update(["chikorita", "cyndaquil"])
+        project.active_dex().entries.discard("venusaur")
+        return project
+
+    def test_journal_replay(self):
+        project = self.make_project()
+        expected = state(project)
+        # Abandoned without close(): everything is in the journal only
+        project.journal.close()
+        self.assertFalse(os.path.exists(self.path))
+
+        reopened = self.open()
+        self.assertEqual(state(reopened), expected)
+        self.assertEqual(reopened.active_dex().order.to_list(), ["charmander", "bulbasaur", "ivysaur"])
+
+    def test_crash_between_snapshot_and_journal_truncation(self):
+        project = self.make_project()
+        expected = state(project)
+        journal = read_bytes(self.journal_path)
+        project.close()
+
+        # The snapshot was written but the old journal survived: replaying
+        # it would create "Old" again next to "Johto"
+        with open(self.journal_path, "wb") as file:
+            file.write(journal)
+
+        reopened = self.open()
+        self.assertEqual(state(reopened), expected)
+        self.assertEqual(reopened.names(), ["My Dex", "Johto"])
+        # The stale journal is emptied down to a fresh generation line
+        self.assertEqual(read_bytes(self.journal_path), json.dumps(["generation", reopened.generation]).encode() + b"\n")
+
+    def test_truncated_journal_line(self):
+        project = self.make_project()
+        expected = state(project)
+        project.journal.close()
+        complete = read_bytes(self.journal_path)
+        with open(self.journal_path, "ab") as file:
+            file.write(b'["add","My Dex",["squir')
+
+        reopened = self.open()
+        self.assertEqual(state(reopened), expected)
+        self.assertEqual(read_bytes(self.journal_path), complete)
+
+        # New changes go after the last complete line
+        reopened.active_dex().entries.add("squirtle")
+        expected = state(reopened)
+        reopened.journal.close()
+        self.assertEqual(state(Project(self.path, read_only=True)), expected)
+
+    def test_read_only(self):
+        project = self.make_project()
+        project.close()
+        project = self.open()
+        project.describe("Second region")
+        project.journal.close()
+        snapshot, journal = read_bytes(self.path), read_bytes(self.journal_path)
+
+        read_only = Project(self.path, read_only=True)
+        self.assertEqual(read_only.active_dex().description, "Second region")
+        read_only.active_dex().entries.add("pikachu")
+        read_only.rename_dex("Johto", "Hoenn")
+        read_only.close()
+        self.assertEqual(read_bytes(self.path), snapshot)
+        self.assertEqual(read_bytes(self.journal_path), journal)
+
+    def test_read_only_journal_only(self):
+        self.make_project().journal.close()
+        journal = read_bytes(self.journal_path)
+        read_only = Project(self.path, read_only=True)
+        self.assertEqual(read_only.names(), ["My Dex", "Johto"])
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(read_bytes(self.journal_path), journal)
+
+    def test_corrupt_snapshot(self):
+        with open(self.path, "w") as file:
+            file.write("{not json")
+        with self.assertRaises(ValueError):
+            Project(self.path)
+        self.assertEqual(read_bytes(self.path), b"{not json")
+
+
+class RegionalOrderTest(unittest.TestCase):
+    def check(self, order, expected):
+        self.assertEqual(order.to_list(), expected)
+        self.assertEqual(len(order), len(expected))
+        for position, name in enumerate(expected):
+            self.assertEqual(order[position], name)
+            self.assertEqual(order.index(name), position)
+        if expected:
+            self.assertEqual(order[-1], expected[-1])
+        if order.root is not None:
+            self.assertIsNone(order.root.parent)
+
+    def test_random_operations_match_a_list(self):
+        # The treap against a plain list under a random mix of operations
+        rng = random.Random(20)
+        order, expected = RegionalOrder(), []
+        next_name = 0
+        for step in range(3000):
+            choice = rng.random()
+            if choice < 0.4 or not expected:
+                name, next_name = f"mon-{next_name}", next_name + 1
+                index = rng.randint(0, len(expected) + 2)
+                order.insert(name, index)
+                expected.insert(index, name)
+            elif choice < 0.6:
+                name = rng.choice(expected)
+                self.assertEqual(order.remove(name), expected.index(name))
+                expected.remove(name)
+            else:
+                name = rng.choice(expected)
+                index = rng.randrange(len(expected))
+                self.assertEqual(order.move(name, index), expected.index(name))
+                expected.remove(name)
+                expected.insert(index, name)
+            if step % 100 == 0:
+                self.check(order, expected)
+        self.check(order, expected)
+
+    def test_errors(self):
+        order = RegionalOrder(["a", "b"])
+        with self.assertRaises(ValueError):
+            order.insert("a")
+        with self.assertRaises(IndexError):
+            order[2]
+        with self.assertRaises(KeyError):
+            order.remove("c")
+        order.discard("c")
+        order.extend(["b", "c"])
+        self.check(order, ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()